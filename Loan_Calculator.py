@@ -2,18 +2,265 @@ import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                              QTextEdit, QGroupBox, QGridLayout, QDateEdit, 
-                             QTableWidget, QTableWidgetItem, QHeaderView, QTabWidget, 
-                             QComboBox, QDialog, QDialogButtonBox, QSpinBox, QDoubleSpinBox)
-from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtGui import QFont, QColor
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
-import calendar
-import json
+                             QTableView, QHeaderView, QTabWidget, 
+                             QComboBox, QDialog, QDialogButtonBox, QSpinBox, QDoubleSpinBox,
+                             QProgressBar, QStyledItemDelegate, QStyle)
+from PyQt6.QtCore import (Qt, QDate, QAbstractTableModel, QModelIndex, QThread, pyqtSignal,
+                          QEvent, QRectF, QSize, QTimer)
+from PyQt6.QtGui import QFont, QColor, QBrush, QPainter, QKeySequence, QShortcut
+from datetime import date, datetime, timedelta
 import os
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from concurrent.futures import ThreadPoolExecutor
+from amortization_engine import AmortizationEngine, CalculationCancelled
+from loan_settings import (SETTINGS_VERSION, date_parser, dump_events, load_events, read_settings,
+                           settings_file_path, write_settings)
+from profiling import profiler
+from schedule_cache import ScheduleCache
+from schedule_export import ROW_COLORS, SCHEDULE_FORMATTERS, write_schedule
+
+SCHEDULE_HEADERS = [
+    "Date", "Beginning\nBalance", "Misc Charges\nBy Bank", 
+    "Interest Rate\n(Annual)", "Interest Rate\n(Daily)", 
+    "Interest Amount\nfor Each Day", "Cumulative\nInterest\nAccrued",
+    "Interest\nDebited By\nBank", "EMI", "Pre-Payment",
+    "Interest Paid", "Principal\nPaid", "Remaining\nBalance",
+    "Balance +\nInterest Due", "Total Interest\nPaid"
+]
+
+
+class ScheduleTableModel(QAbstractTableModel):
+    """Amortization table backed by an engine result; cells are formatted only when painted"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.result = None
+        self.row_count = 0
+        self.brushes = {kind: QBrush(QColor(color)) for kind, color in ROW_COLORS.items()}
+    
+    def set_result(self, result, unchanged_rows=0):
+        """Show a new ScheduleResult (or nothing, for None)
+        
+        When the first ``unchanged_rows`` rows of the new result match the
+        shown ones, only the rows after them are replaced, so the view keeps
+        its scroll position and selection.
+        """
+        if self.result is None or result is None or not unchanged_rows:
+            self.beginResetModel()
+            self.result = result
+            self.row_count = len(result) if result is not None else 0
+            self.endResetModel()
+            return
+        
+        if self.row_count > unchanged_rows:
+            self.beginRemoveRows(QModelIndex(), unchanged_rows, self.row_count - 1)
+            self.row_count = unchanged_rows
+            self.endRemoveRows()
+        self.result = result
+        if len(result) > unchanged_rows:
+            self.beginInsertRows(QModelIndex(), unchanged_rows, len(result) - 1)
+            self.row_count = len(result)
+            self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.row_count
+    
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(SCHEDULE_HEADERS)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or self.result is None:
+            return None
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            if profiler.enabled:
+                with profiler.phase('table.format_cell'):
+                    return SCHEDULE_FORMATTERS[column](self.result.column(column)[index.row()])
+            return SCHEDULE_FORMATTERS[column](self.result.column(column)[index.row()])
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if profiler.enabled:
+                with profiler.phase('table.row_colour'):
+                    return self.brushes.get(self.result.kind[index.row()])
+            return self.brushes.get(self.result.kind[index.row()])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return SCHEDULE_HEADERS[section]
+        return None
+
+
+# Colours of the delete action drawn in event list dialogs
+DELETE_ACTION_COLOR = "#e74c3c"
+DELETE_ACTION_HOVER_COLOR = "#c0392b"
+
+
+def _prepayment_details(pp):
+    if pp['type'] == 'single':
+        return f"Date: {pp['date'].strftime('%d-%m-%Y')}"
+    end_str = pp['end_date'].strftime('%d-%m-%Y') if pp['end_date'] else "No End"
+    return f"Day {pp['day']} | From: {pp['start_date'].strftime('%d-%m-%Y')} | To: {end_str}"
+
+
+_CENTER = Qt.AlignmentFlag.AlignCenter
+_RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+_LEFT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+# (header, formatter, alignment, stretch) of the columns of each event list
+MANUAL_EMI_COLUMNS = (
+    ("Date", lambda emi: emi['date'].strftime('%d-%m-%Y'), _CENTER, False),
+    ("Amount", lambda emi: f"₹{emi['amount']:,.2f}", _RIGHT, False),
+    ("Note", lambda emi: emi['note'] if emi['note'] else "-", _LEFT, True),
+)
+BANK_CHARGE_COLUMNS = (
+    ("Date", lambda charge: charge['date'].strftime('%d-%m-%Y'), _CENTER, False),
+    ("Amount", lambda charge: f"₹{charge['amount']:,.2f}", _RIGHT, False),
+    ("Description", lambda charge: charge['description'] if charge['description'] else "-", _LEFT, True),
+)
+PREPAYMENT_COLUMNS = (
+    ("Type", lambda pp: "Single" if pp['type'] == 'single' else "Recurring", _CENTER, False),
+    ("Amount", lambda pp: f"₹{pp['amount']:,.2f}", _RIGHT, False),
+    ("Details", _prepayment_details, _LEFT, True),
+)
+RATE_REVISION_COLUMNS = (
+    ("Effective From", lambda rev: rev['date'].strftime('%d-%m-%Y'), _CENTER, True),
+    ("New APR", lambda rev: f"{rev['apr']}%", _CENTER, False),
+)
+
+
+class EventListModel(QAbstractTableModel):
+    """Table over a list of event dicts, with a trailing delete action column"""
+    
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.items = []
+    
+    def set_items(self, items):
+        """Show a (new or changed) list of events"""
+        self.beginResetModel()
+        self.items = items
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.items)
+    
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns) + 1
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.column() >= len(self.columns):
+            return None
+        header, formatter, alignment, stretch = self.columns[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return formatter(self.items[index.row()])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return alignment
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section][0] if section < len(self.columns) else "Action"
+        return None
+
+
+class DeleteActionDelegate(QStyledItemDelegate):
+    """Paints a delete button in a cell and reports clicks on it, without a widget per row"""
+    
+    deleteRequested = pyqtSignal(int)
+    
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(6, 4, -6, -4)
+        hovered = option.state & QStyle.StateFlag.State_MouseOver
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(DELETE_ACTION_HOVER_COLOR if hovered else DELETE_ACTION_COLOR))
+        painter.drawRoundedRect(QRectF(rect), 9, 9)
+        font = QFont(option.font)
+        font.setPixelSize(11)
+        painter.setFont(font)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "🗑️ Delete")
+        painter.restore()
+    
+    def sizeHint(self, option, index):
+        return QSize(100, 30)
+    
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and option.rect.contains(event.position().toPoint())):
+            self.deleteRequested.emit(index.row())
+            return True
+        return False
+
+
+class EventListDialog(QDialog):
+    """Reusable list of events with a delete action per row"""
+    
+    def __init__(self, title, columns, min_width, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setMinimumWidth(min_width)
+        self.setMinimumHeight(400)
+        # Called with the row index when its delete action is clicked
+        self.on_delete = None
+        layout = QVBoxLayout(self)
+        
+        self.model = EventListModel(columns, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setMouseTracking(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setDefaultSectionSize(34)
+        
+        header = self.table.horizontalHeader()
+        header.setResizeContentsPrecision(100)
+        for section, column in enumerate(columns):
+            stretch = column[3]
+            header.setSectionResizeMode(
+                section,
+                QHeaderView.ResizeMode.Stretch if stretch else QHeaderView.ResizeMode.ResizeToContents
+            )
+        header.setSectionResizeMode(len(columns), QHeaderView.ResizeMode.Fixed)
+        header.resizeSection(len(columns), 110)
+        
+        self.delete_delegate = DeleteActionDelegate(self.table)
+        self.delete_delegate.deleteRequested.connect(self.delete_row)
+        self.table.setItemDelegateForColumn(len(columns), self.delete_delegate)
+        layout.addWidget(self.table)
+        
+        # OK button
+        button_layout = QHBoxLayout()
+        ok_btn = QPushButton("OK")
+        ok_btn.clicked.connect(self.accept)
+        button_layout.addStretch()
+        button_layout.addWidget(ok_btn)
+        layout.addLayout(button_layout)
+    
+    def delete_row(self, row):
+        if self.on_delete is not None:
+            self.on_delete(row)
+    
+    def show_items(self, items, on_delete):
+        """Show a list of events modally; ``on_delete(row)`` handles delete clicks"""
+        self.on_delete = on_delete
+        self.model.set_items(items)
+        self.exec()
+
 
 class ExcludeMonthsDialog(QDialog):
     def __init__(self, existing_exclusions=None, parent=None):
@@ -453,6 +700,196 @@ class InterestRateRevisionDialog(QDialog):
     def get_revisions(self):
         return sorted(self.revisions, key=lambda x: x['date'])
 
+
+class ProfileDialog(QDialog):
+    """Search the saved loan profiles and pick one to open or delete"""
+    
+    # Profiles listed at a time; the search narrows down larger stores
+    LIST_LIMIT = 200
+    
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        from PyQt6.QtWidgets import QListWidget
+        self.setWindowTitle("Open Loan Profile")
+        self.setModal(True)
+        self.setMinimumWidth(450)
+        self.store = store
+        
+        layout = QVBoxLayout(self)
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search profiles by name")
+        self.search_input.textChanged.connect(self.refresh)
+        layout.addWidget(self.search_input)
+        
+        self.profile_list = QListWidget()
+        self.profile_list.itemDoubleClicked.connect(self.accept)
+        layout.addWidget(self.profile_list)
+        
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Open | 
+                                     QDialogButtonBox.StandardButton.Cancel)
+        delete_btn = button_box.addButton("Delete", QDialogButtonBox.ButtonRole.ActionRole)
+        delete_btn.clicked.connect(self.delete_selected)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        self.refresh()
+    
+    def refresh(self):
+        from PyQt6.QtWidgets import QListWidgetItem
+        self.profile_list.clear()
+        profiles = self.store.search(self.search_input.text(), limit=self.LIST_LIMIT)
+        for profile in profiles:
+            item = QListWidgetItem(
+                f"{profile.name}    ₹{profile.loan_amount or 0:,.0f} @ {profile.apr or 0}% "
+                f"for {profile.tenure_months or 0} months    (saved {profile.updated_at.replace('T', ' ')})"
+            )
+            item.setData(Qt.ItemDataRole.UserRole, profile.name)
+            self.profile_list.addItem(item)
+        if profiles:
+            self.profile_list.setCurrentRow(0)
+        total = self.store.count()
+        self.count_label.setText(f"Showing {len(profiles)} of {total} saved profiles")
+    
+    def selected_name(self):
+        item = self.profile_list.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item else None
+    
+    def delete_selected(self):
+        from PyQt6.QtWidgets import QMessageBox
+        name = self.selected_name()
+        if name is None:
+            return
+        reply = QMessageBox.question(
+            self,
+            "Confirm Delete",
+            f"Delete the saved profile '{name}'?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.store.delete(name)
+            self.refresh()
+
+
+class DiagnosticsDialog(QDialog):
+    """Phase timings recorded by the profiler, with controls to record and save them"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        from PyQt6.QtWidgets import QCheckBox
+        from PyQt6.QtGui import QFontDatabase
+        self.setWindowTitle("Diagnostics")
+        self.setMinimumSize(650, 400)
+        
+        layout = QVBoxLayout(self)
+        
+        self.enabled_check = QCheckBox("Record phase timings")
+        self.enabled_check.setChecked(profiler.enabled)
+        self.enabled_check.toggled.connect(self.set_enabled)
+        layout.addWidget(self.enabled_check)
+        
+        self.report_text = QTextEdit()
+        self.report_text.setReadOnly(True)
+        self.report_text.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        layout.addWidget(self.report_text)
+        
+        button_layout = QHBoxLayout()
+        for label, slot in (("Refresh", self.refresh), ("Reset", self.reset),
+                            ("Save to File...", self.save_report), ("Close", self.close)):
+            button = QPushButton(label)
+            button.clicked.connect(slot)
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+        
+        self.refresh()
+    
+    def set_enabled(self, enabled):
+        profiler.enabled = enabled
+        self.refresh()
+    
+    def refresh(self):
+        state = "on" if profiler.enabled else "off"
+        self.report_text.setPlainText(f"Recording is {state}.\n\n{profiler.format_report()}")
+    
+    def reset(self):
+        profiler.reset()
+        self.refresh()
+    
+    def save_report(self):
+        from PyQt6.QtWidgets import QFileDialog, QMessageBox
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Timings", "loan_calculator_profile.json", "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            profiler.dump(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save timings:\n{str(e)}")
+
+
+class CalculationWorker(QThread):
+    """Runs an AmortizationEngine off the GUI thread"""
+    
+    progress = pyqtSignal(int)
+    succeeded = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, engine, max_rows=None, parent=None, previous=None, changed_on=None, cache=None,
+                 money='float'):
+        super().__init__(parent)
+        self.engine = engine
+        self.max_rows = max_rows
+        self.money = money
+        # ScheduleCache consulted before calculating and filled after
+        self.cache = cache
+        self.cached = False
+        # Earlier schedule to resume from, valid for dates before changed_on
+        self.previous = previous
+        self.changed_on = changed_on
+        self.cancelled = False
+    
+    def cancel(self):
+        """Ask the calculation to stop at its next progress report"""
+        self.cancelled = True
+    
+    def report_progress(self, fraction):
+        if self.cancelled:
+            raise CalculationCancelled()
+        self.progress.emit(int(fraction * 100))
+    
+    def run(self):
+        try:
+            result = None
+            if self.cache is not None:
+                with profiler.phase('calculate.cache_lookup'):
+                    key = self.cache.key(self.engine, self.max_rows, money=self.money)
+                    result = self.cache.get(key)
+                self.cached = result is not None
+            if result is None:
+                if self.previous is not None:
+                    with profiler.phase('calculate.engine_resume'):
+                        result = self.engine.resume(self.previous, self.changed_on, max_rows=self.max_rows,
+                                                    progress=self.report_progress)
+                else:
+                    with profiler.phase('calculate.engine_run'):
+                        result = self.engine.run(max_rows=self.max_rows, progress=self.report_progress,
+                                                 money=self.money)
+                if self.cache is not None:
+                    self.cache.put(key, result)
+        except CalculationCancelled:
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        # A result finished just as the calculation was cancelled is dropped too
+        if not self.cancelled:
+            self.succeeded.emit(self.engine, result)
+
+
 class LoanCalculatorApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -466,6 +903,31 @@ class LoanCalculatorApp(QMainWindow):
         self.emi_exclusions = []
         self.interest_rate_revisions = []
         
+        # Optional cap on schedule rows (None = no limit); set via settings.json
+        self.max_schedule_rows = None
+        # Money arithmetic of schedules, 'float' or 'paise'; set via settings.json
+        self.money_mode = 'float'
+        
+        # Event list dialogs, built on first use and then reused
+        self.event_list_dialogs = {}
+        
+        # Worker thread of the calculation in progress, if any
+        self.calc_worker = None
+        # Engine, row limit and money mode that produced the schedule shown
+        self.schedule_engine = None
+        self.schedule_max_rows = None
+        self.schedule_money_mode = None
+        # Recent schedules by input fingerprint, so repeated and what-if
+        # calculations return at once
+        self.schedule_cache = ScheduleCache()
+        
+        # Diagnostics panel of profiler timings, built on first use
+        self.diagnostics_dialog = None
+        
+        # Saved loan profiles, opened on first use
+        self.profile_store = None
+        self.profile_name = None
+        
         # Set modern stylesheet
         # Set modern stylesheet
         self.setStyleSheet("""
@@ -615,14 +1077,14 @@ class LoanCalculatorApp(QMainWindow):
                 min-width: 80px;
                 padding: 10px 20px;
             }
-            QTableWidget {
+            QTableWidget, QTableView {
                 border: 2px solid #bdc3c7;
                 border-radius: 8px;
                 background-color: #ffffff;
                 gridline-color: #ecf0f1;
                 font-size: 12px;
             }
-            QTableWidget::item {
+            QTableWidget::item, QTableView::item {
                 padding: 5px;
             }
             QHeaderView::section {
@@ -717,8 +1179,20 @@ class LoanCalculatorApp(QMainWindow):
         self.collapse_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.collapse_btn.clicked.connect(self.toggle_input_fields)
         
+        self.save_profile_btn = QPushButton("💾 Save Profile")
+        self.save_profile_btn.setStyleSheet(self.collapse_btn.styleSheet())
+        self.save_profile_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.save_profile_btn.clicked.connect(self.save_profile)
+        
+        self.open_profile_btn = QPushButton("📂 Open Profile")
+        self.open_profile_btn.setStyleSheet(self.collapse_btn.styleSheet())
+        self.open_profile_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.open_profile_btn.clicked.connect(self.open_profile)
+        
         input_header_layout.addWidget(input_title)
         input_header_layout.addStretch()
+        input_header_layout.addWidget(self.save_profile_btn)
+        input_header_layout.addWidget(self.open_profile_btn)
         input_header_layout.addWidget(self.collapse_btn)
         
         # Input fields group
@@ -1174,24 +1648,20 @@ class LoanCalculatorApp(QMainWindow):
         self.tab_widget.addTab(self.summary_text, "📋 Summary")
         
         # Amortization schedule table
-        self.schedule_table = QTableWidget()
-        self.schedule_table.setColumnCount(15)
-        self.schedule_table.setHorizontalHeaderLabels([
-            "Date", "Beginning\nBalance", "Misc Charges\nBy Bank", 
-            "Interest Rate\n(Annual)", "Interest Rate\n(Daily)", 
-            "Interest Amount\nfor Each Day", "Cumulative\nInterest\nAccrued",
-            "Interest\nDebited By\nBank", "EMI", "Pre-Payment",
-            "Interest Paid", "Principal\nPaid", "Remaining\nBalance",
-            "Balance +\nInterest Due", "Total Interest\nPaid"
-        ])
+        self.schedule_model = ScheduleTableModel(self)
+        self.schedule_table = QTableView()
+        self.schedule_table.setModel(self.schedule_model)
         
         # Set table properties
+        # Column widths are measured on a sample of rows, not the whole schedule
+        self.schedule_table.horizontalHeader().setResizeContentsPrecision(200)
         self.schedule_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
         self.schedule_table.setAlternatingRowColors(True)
         self.schedule_table.verticalHeader().setVisible(False)
-        self.schedule_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.schedule_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.schedule_table.cellDoubleClicked.connect(self.edit_prepayment_cell)
+        self.schedule_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.schedule_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.schedule_table.doubleClicked.connect(
+            lambda index: self.edit_prepayment_cell(index.row(), index.column()))
         
         self.tab_widget.addTab(self.schedule_table, "📅 Amortization Schedule")
         
@@ -1219,6 +1689,17 @@ class LoanCalculatorApp(QMainWindow):
         self.clear_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.clear_btn.clicked.connect(self.clear_fields)
         
+        # Progress of a running calculation, shown only while it runs
+        self.calc_progress = QProgressBar()
+        self.calc_progress.setRange(0, 100)
+        self.calc_progress.setFixedWidth(200)
+        self.calc_progress.hide()
+        
+        self.cancel_calc_btn = QPushButton("✖ Cancel")
+        self.cancel_calc_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.cancel_calc_btn.clicked.connect(self.cancel_calculation)
+        self.cancel_calc_btn.hide()
+        
         # Credit label
         credit_label = QLabel("Developed by Yogesh Khurana")
         credit_label.setStyleSheet("""
@@ -1233,11 +1714,29 @@ class LoanCalculatorApp(QMainWindow):
         button_layout.addWidget(self.calculate_btn)
         button_layout.addWidget(self.export_btn)
         button_layout.addWidget(self.clear_btn)
+        button_layout.addWidget(self.calc_progress)
+        button_layout.addWidget(self.cancel_calc_btn)
         button_layout.addStretch(2)  # Larger stretch in middle
         button_layout.addWidget(credit_label)
         
         main_layout.addLayout(button_layout)
         self.load_settings()
+        
+        # Settings are saved in the background shortly after each edit, so a
+        # crash loses at most the last second of changes
+        self.settings_writer = ThreadPoolExecutor(max_workers=1)
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(1000)
+        self.save_timer.timeout.connect(self.save_settings_in_background)
+        for field in (self.loan_amount, self.apr, self.year_base, self.emi, self.emi_date, self.loan_tenure):
+            field.textChanged.connect(self.schedule_save)
+        self.loan_start_dt.dateChanged.connect(self.schedule_save)
+        self.interest_charged_date.currentTextChanged.connect(self.schedule_save)
+        
+        # Phase timings are shown on demand
+        diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        diagnostics_shortcut.activated.connect(self.show_diagnostics)
     
     def toggle_input_fields(self):
         """Toggle collapse/expand of input fields"""
@@ -1260,13 +1759,7 @@ class LoanCalculatorApp(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.emi_exclusions = dialog.get_exclusions()
             self.exclude_emi_btn.setText(f"Ex ({len(self.emi_exclusions)})")
-    
-    def is_emi_excluded(self, date):
-        """Check if EMI is excluded for this date's month/year"""
-        for exclusion in self.emi_exclusions:
-            if date.month == exclusion['month'] and date.year == exclusion['year']:
-                return True
-        return False
+            self.schedule_save()
     
     def add_manual_emi(self):
         """Open dialog to add manual EMI"""
@@ -1275,6 +1768,7 @@ class LoanCalculatorApp(QMainWindow):
             emi_data = dialog.get_emi_data()
             self.manual_emis.append(emi_data)
             self.view_manual_emis_btn.setText(f"View ({len(self.manual_emis)})")
+            self.schedule_save()
     
     def view_manual_emis(self):
         """View all manual EMIs with delete option"""
@@ -1289,70 +1783,11 @@ class LoanCalculatorApp(QMainWindow):
             dialog.exec()
             return
         
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Manual EMIs List")
-        dialog.setMinimumWidth(600)
-        dialog.setMinimumHeight(400)
-        layout = QVBoxLayout(dialog)
-        
-        # Create table
-        table = QTableWidget()
-        table.setColumnCount(4)
-        table.setHorizontalHeaderLabels(["Date", "Amount", "Note", "Action"])
-        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        
-        def refresh_table():
-            """Refresh the table content"""
-            table.setRowCount(len(self.manual_emis))
-            for i, emi in enumerate(self.manual_emis):
-                # Date
-                date_item = QTableWidgetItem(emi['date'].strftime('%d-%m-%Y'))
-                date_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                table.setItem(i, 0, date_item)
-                
-                # Amount
-                amount_item = QTableWidgetItem(f"₹{emi['amount']:,.2f}")
-                amount_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                table.setItem(i, 1, amount_item)
-                
-                # Note
-                note_item = QTableWidgetItem(emi['note'] if emi['note'] else "-")
-                table.setItem(i, 2, note_item)
-                
-                # Delete button
-                delete_btn = QPushButton("🗑️ Delete")
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #e74c3c;
-                        color: white;
-                        border: none;
-                        border-radius: 9px;
-                        padding: 5px 14px;
-                        font-size: 11px;
-                        min-width: 50px;
-                    }
-                    QPushButton:hover {
-                        background-color: #c0392b;
-                    }
-                """)
-                delete_btn.clicked.connect(lambda checked, idx=i: self.delete_manual_emi(idx, dialog, refresh_table))
-                table.setCellWidget(i, 3, delete_btn)
-        
-        refresh_table()
-        layout.addWidget(table)
-        
-        # OK button
-        button_layout = QHBoxLayout()
-        ok_btn = QPushButton("OK")
-        ok_btn.clicked.connect(dialog.accept)
-        button_layout.addStretch()
-        button_layout.addWidget(ok_btn)
-        layout.addLayout(button_layout)
-        
-        dialog.exec()
+        dialog = self.event_list_dialog('manual_emis', "Manual EMIs List", MANUAL_EMI_COLUMNS, 600)
+        dialog.show_items(
+            self.manual_emis,
+            lambda index: self.delete_manual_emi(index, dialog, lambda: dialog.model.set_items(self.manual_emis))
+        )
     
     def delete_manual_emi(self, index, dialog, refresh_callback):
         """Delete a manual EMI"""
@@ -1369,6 +1804,7 @@ class LoanCalculatorApp(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             self.manual_emis.pop(index)
             self.view_manual_emis_btn.setText(f"View ({len(self.manual_emis)})")
+            self.schedule_save()
             # Check if list is empty
             if not self.manual_emis:
                 dialog.accept()  # Close dialog if no items left
@@ -1378,14 +1814,7 @@ class LoanCalculatorApp(QMainWindow):
         """Clear all manual EMIs"""
         self.manual_emis = []
         self.view_manual_emis_btn.setText("View (0)")
-    
-    def get_manual_emi_for_date(self, date):
-        """Get total manual EMI amount for a specific date"""
-        total = 0
-        for emi in self.manual_emis:
-            if emi['date'].date() == date.date():
-                total += emi['amount']
-        return total
+        self.schedule_save()
     
     def add_bank_charge(self):
         """Open dialog to add bank charge"""
@@ -1394,6 +1823,7 @@ class LoanCalculatorApp(QMainWindow):
             charge_data = dialog.get_charge_data()
             self.bank_charges.append(charge_data)
             self.view_bank_charges_btn.setText(f"View ({len(self.bank_charges)})")
+            self.schedule_save()
     
     def view_bank_charges(self):
         """View all bank charges with delete option"""
@@ -1408,70 +1838,11 @@ class LoanCalculatorApp(QMainWindow):
             dialog.exec()
             return
         
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Bank Charges List")
-        dialog.setMinimumWidth(600)
-        dialog.setMinimumHeight(400)
-        layout = QVBoxLayout(dialog)
-        
-        # Create table
-        table = QTableWidget()
-        table.setColumnCount(4)
-        table.setHorizontalHeaderLabels(["Date", "Amount", "Description", "Action"])
-        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        
-        def refresh_table():
-            """Refresh the table content"""
-            table.setRowCount(len(self.bank_charges))
-            for i, charge in enumerate(self.bank_charges):
-                # Date
-                date_item = QTableWidgetItem(charge['date'].strftime('%d-%m-%Y'))
-                date_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                table.setItem(i, 0, date_item)
-                
-                # Amount
-                amount_item = QTableWidgetItem(f"₹{charge['amount']:,.2f}")
-                amount_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                table.setItem(i, 1, amount_item)
-                
-                # Description
-                desc_item = QTableWidgetItem(charge['description'] if charge['description'] else "-")
-                table.setItem(i, 2, desc_item)
-                
-                # Delete button
-                delete_btn = QPushButton("🗑️ Delete")
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #e74c3c;
-                        color: white;
-                        border: none;
-                        border-radius: 9px;
-                        padding: 5px 14px;
-                        font-size: 11px;
-                        min-width: 50px;
-                    }
-                    QPushButton:hover {
-                        background-color: #c0392b;
-                    }
-                """)
-                delete_btn.clicked.connect(lambda checked, idx=i: self.delete_bank_charge(idx, dialog, refresh_table))
-                table.setCellWidget(i, 3, delete_btn)
-        
-        refresh_table()
-        layout.addWidget(table)
-        
-        # OK button
-        button_layout = QHBoxLayout()
-        ok_btn = QPushButton("OK")
-        ok_btn.clicked.connect(dialog.accept)
-        button_layout.addStretch()
-        button_layout.addWidget(ok_btn)
-        layout.addLayout(button_layout)
-        
-        dialog.exec()
+        dialog = self.event_list_dialog('bank_charges', "Bank Charges List", BANK_CHARGE_COLUMNS, 600)
+        dialog.show_items(
+            self.bank_charges,
+            lambda index: self.delete_bank_charge(index, dialog, lambda: dialog.model.set_items(self.bank_charges))
+        )
     
     def delete_bank_charge(self, index, dialog, refresh_callback):
         """Delete a bank charge"""
@@ -1488,6 +1859,7 @@ class LoanCalculatorApp(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             self.bank_charges.pop(index)
             self.view_bank_charges_btn.setText(f"View ({len(self.bank_charges)})")
+            self.schedule_save()
             # Check if list is empty
             if not self.bank_charges:
                 dialog.accept()  # Close dialog if no items left
@@ -1497,14 +1869,7 @@ class LoanCalculatorApp(QMainWindow):
         """Clear all bank charges"""
         self.bank_charges = []
         self.view_bank_charges_btn.setText("View (0)")
-    
-    def get_bank_charge_for_date(self, date):
-        """Get total bank charge amount for a specific date"""
-        total = 0
-        for charge in self.bank_charges:
-            if charge['date'].date() == date.date():
-                total += charge['amount']
-        return total
+        self.schedule_save()
     
     def add_prepayment(self):
         """Open dialog to add prepayment"""
@@ -1513,6 +1878,7 @@ class LoanCalculatorApp(QMainWindow):
             prepayment_data = dialog.get_prepayment_data()
             self.prepayments.append(prepayment_data)
             self.view_prepayments_btn.setText(f"View ({len(self.prepayments)})")
+            self.schedule_save()
     
     def view_prepayments(self):
         """View all prepayments with delete option"""
@@ -1527,76 +1893,11 @@ class LoanCalculatorApp(QMainWindow):
             dialog.exec()
             return
         
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Pre-Payments List")
-        dialog.setMinimumWidth(700)
-        dialog.setMinimumHeight(400)
-        layout = QVBoxLayout(dialog)
-        
-        # Create table
-        table = QTableWidget()
-        table.setColumnCount(4)
-        table.setHorizontalHeaderLabels(["Type", "Amount", "Details", "Action"])
-        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        
-        def refresh_table():
-            """Refresh the table content"""
-            table.setRowCount(len(self.prepayments))
-            for i, pp in enumerate(self.prepayments):
-                # Type
-                type_item = QTableWidgetItem("Single" if pp['type'] == 'single' else "Recurring")
-                type_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                table.setItem(i, 0, type_item)
-                
-                # Amount
-                amount_item = QTableWidgetItem(f"₹{pp['amount']:,.2f}")
-                amount_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                table.setItem(i, 1, amount_item)
-                
-                # Details
-                if pp['type'] == 'single':
-                    details = f"Date: {pp['date'].strftime('%d-%m-%Y')}"
-                else:
-                    end_str = pp['end_date'].strftime('%d-%m-%Y') if pp['end_date'] else "No End"
-                    details = f"Day {pp['day']} | From: {pp['start_date'].strftime('%d-%m-%Y')} | To: {end_str}"
-                
-                details_item = QTableWidgetItem(details)
-                table.setItem(i, 2, details_item)
-                
-                # Delete button
-                delete_btn = QPushButton("🗑️ Delete")
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #e74c3c;
-                        color: white;
-                        border: none;
-                        border-radius: 9px;
-                        padding: 5px 14px;
-                        font-size: 11px;
-                        min-width: 50px;
-                    }
-                    QPushButton:hover {
-                        background-color: #c0392b;
-                    }
-                """)
-                delete_btn.clicked.connect(lambda checked, idx=i: self.delete_prepayment(idx, dialog, refresh_table))
-                table.setCellWidget(i, 3, delete_btn)
-        
-        refresh_table()
-        layout.addWidget(table)
-        
-        # OK button
-        button_layout = QHBoxLayout()
-        ok_btn = QPushButton("OK")
-        ok_btn.clicked.connect(dialog.accept)
-        button_layout.addStretch()
-        button_layout.addWidget(ok_btn)
-        layout.addLayout(button_layout)
-        
-        dialog.exec()
+        dialog = self.event_list_dialog('prepayments', "Pre-Payments List", PREPAYMENT_COLUMNS, 700)
+        dialog.show_items(
+            self.prepayments,
+            lambda index: self.delete_prepayment(index, dialog, lambda: dialog.model.set_items(self.prepayments))
+        )
     
     def delete_prepayment(self, index, dialog, refresh_callback):
         """Delete a prepayment"""
@@ -1618,6 +1919,7 @@ class LoanCalculatorApp(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             self.prepayments.pop(index)
             self.view_prepayments_btn.setText(f"View ({len(self.prepayments)})")
+            self.schedule_save()
             # Check if list is empty
             if not self.prepayments:
                 dialog.accept()  # Close dialog if no items left
@@ -1627,24 +1929,19 @@ class LoanCalculatorApp(QMainWindow):
         """Clear all prepayments"""
         self.prepayments = []
         self.view_prepayments_btn.setText("View (0)")
+        self.schedule_save()
     
     def edit_prepayment_cell(self, row, col):
         """Allow editing prepayment in table cell"""
         if col != 9:  # Only allow editing Pre-Payment column
             return
         
-        date_item = self.schedule_table.item(row, 0)
-        if not date_item:
+        result = self.schedule_model.result
+        if result is None or row >= len(result):
             return
         
-        date_str = date_item.text()
-        current_value_item = self.schedule_table.item(row, 9)
-        current_value = 0
-        if current_value_item and current_value_item.text():
-            try:
-                current_value = float(current_value_item.text().replace('₹', '').replace(',', ''))
-            except:
-                current_value = 0
+        date_str = result.date_at(row).strftime("%d-%m-%Y")
+        current_value = result.prepayment[row]
         
         dialog = QDialog(self)
         dialog.setWindowTitle(f"Edit Pre-Payment for {date_str}")
@@ -1671,6 +1968,10 @@ class LoanCalculatorApp(QMainWindow):
             # Parse the date
             date_obj = datetime.strptime(date_str, "%d-%m-%Y")
             
+            # Rows before this date can be kept only if nothing else has
+            # changed since the schedule was calculated
+            changed_on = date_obj if self.schedule_is_current() else None
+            
             # Add or update single prepayment for this date
             found = False
             for pp in self.prepayments:
@@ -1686,32 +1987,19 @@ class LoanCalculatorApp(QMainWindow):
                     'date': date_obj
                 })
             
+            self.view_prepayments_btn.setText(f"View ({len(self.prepayments)})")
+            self.schedule_save()
+            
             # Recalculate
-            self.calculate()
+            self.recalculate_from(changed_on)
     
-    def get_prepayment_for_date(self, date):
-        """Get total prepayment amount for a specific date"""
-        total = 0
-        
-        for pp in self.prepayments:
-            if pp['type'] == 'single':
-                if pp['date'].date() == date.date():
-                    total += pp['amount']
-                    
-            elif pp['type'] == 'recurring':
-                if pp['start_date'].date() <= date.date():
-                    if pp['end_date'] is None or date.date() <= pp['end_date'].date():
-                        if date.day == pp['day']:
-                            total += pp['amount']
-        
-        return total
-        
     def add_interest_rate_revision(self):
         """Open dialog to add interest rate revision"""
         dialog = InterestRateRevisionDialog(self.interest_rate_revisions, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.interest_rate_revisions = dialog.get_revisions()
             self.view_rate_revisions_btn.setText(f"View ({len(self.interest_rate_revisions)})")
+            self.schedule_save()
     
     def view_interest_rate_revisions(self):
         """View all interest rate revisions with delete option"""
@@ -1726,65 +2014,11 @@ class LoanCalculatorApp(QMainWindow):
             dialog.exec()
             return
         
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Interest Rate Revisions List")
-        dialog.setMinimumWidth(600)
-        dialog.setMinimumHeight(400)
-        layout = QVBoxLayout(dialog)
-        
-        # Create table
-        table = QTableWidget()
-        table.setColumnCount(3)
-        table.setHorizontalHeaderLabels(["Effective From", "New APR", "Action"])
-        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        
-        def refresh_table():
-            """Refresh the table content"""
-            table.setRowCount(len(self.interest_rate_revisions))
-            for i, rev in enumerate(self.interest_rate_revisions):
-                # Date
-                date_item = QTableWidgetItem(rev['date'].strftime('%d-%m-%Y'))
-                date_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                table.setItem(i, 0, date_item)
-                
-                # APR
-                apr_item = QTableWidgetItem(f"{rev['apr']}%")
-                apr_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                table.setItem(i, 1, apr_item)
-                
-                # Delete button
-                delete_btn = QPushButton("🗑️ Delete")
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #e74c3c;
-                        color: white;
-                        border: none;
-                        border-radius: 9px;
-                        padding: 5px 14px;
-                        font-size: 11px;
-                        min-width: 50px;
-                    }
-                    QPushButton:hover {
-                        background-color: #c0392b;
-                    }
-                """)
-                delete_btn.clicked.connect(lambda checked, idx=i: self.delete_interest_rate_revision(idx, dialog, refresh_table))
-                table.setCellWidget(i, 2, delete_btn)
-        
-        refresh_table()
-        layout.addWidget(table)
-        
-        # OK button
-        button_layout = QHBoxLayout()
-        ok_btn = QPushButton("OK")
-        ok_btn.clicked.connect(dialog.accept)
-        button_layout.addStretch()
-        button_layout.addWidget(ok_btn)
-        layout.addLayout(button_layout)
-        
-        dialog.exec()
+        dialog = self.event_list_dialog('interest_rate_revisions', "Interest Rate Revisions List", RATE_REVISION_COLUMNS, 600)
+        dialog.show_items(
+            self.interest_rate_revisions,
+            lambda index: self.delete_interest_rate_revision(index, dialog, lambda: dialog.model.set_items(self.interest_rate_revisions))
+        )
     
     def delete_interest_rate_revision(self, index, dialog, refresh_callback):
         """Delete an interest rate revision"""
@@ -1801,6 +2035,7 @@ class LoanCalculatorApp(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             self.interest_rate_revisions.pop(index)
             self.view_rate_revisions_btn.setText(f"View ({len(self.interest_rate_revisions)})")
+            self.schedule_save()
             # Check if list is empty
             if not self.interest_rate_revisions:
                 dialog.accept()  # Close dialog if no items left
@@ -1810,265 +2045,144 @@ class LoanCalculatorApp(QMainWindow):
         """Clear all interest rate revisions"""
         self.interest_rate_revisions = []
         self.view_rate_revisions_btn.setText("View (0)")
+        self.schedule_save()
     
-    def get_apr_for_date(self, date):
-        """Get applicable APR for a specific date based on revisions"""
-        base_apr = float(self.apr.text())
-        
-        # If no revisions, return base APR
-        if not self.interest_rate_revisions:
-            return base_apr
+    def build_engine(self):
+        """Create an amortization engine from the current input fields"""
+        start_date = self.loan_start_dt.date()
+        # The engine gets its own copies of the events, so edits made while
+        # it runs in the background do not reach it
+        return AmortizationEngine(
+            loan_amount=float(self.loan_amount.text()),
+            apr=float(self.apr.text()),
+            year_base=int(self.year_base.text()),
+            start_date=datetime(start_date.year(), start_date.month(), start_date.day()),
+            emi_amount=float(self.emi.text()),
+            emi_day=int(self.emi_date.text()),
+            tenure_months=int(self.loan_tenure.text()),
+            interest_charged_date=self.interest_charged_date.currentText(),
+            prepayments=[dict(item) for item in self.prepayments],
+            bank_charges=[dict(item) for item in self.bank_charges],
+            manual_emis=[dict(item) for item in self.manual_emis],
+            emi_exclusions=[dict(item) for item in self.emi_exclusions],
+            interest_rate_revisions=[dict(item) for item in self.interest_rate_revisions],
+        )
+    
+    def event_list_dialog(self, key, title, columns, min_width):
+        """Get the list dialog of an event type, creating it on first use"""
+        dialog = self.event_list_dialogs.get(key)
+        if dialog is None:
+            dialog = self.event_list_dialogs[key] = EventListDialog(title, columns, min_width, self)
+        return dialog
+    
+    def calculate(self):
+        """Calculate loan amortization schedule in a background thread"""
+        self.recalculate_from(None)
+    
+    def schedule_is_current(self):
+        """Check whether the shown schedule was calculated from the current inputs"""
+        if (self.schedule_engine is None or self.schedule_max_rows != self.max_schedule_rows
+                or self.schedule_money_mode != self.money_mode):
+            return False
+        try:
+            return self.build_engine().inputs() == self.schedule_engine.inputs()
+        except Exception:
+            return False
+    
+    def recalculate_from(self, changed_on):
+        """Calculate the schedule, reusing the shown one before ``changed_on``
         
-        # Find the most recent revision before or on this date
-        applicable_apr = base_apr
-        for revision in self.interest_rate_revisions:
-            if revision['date'].date() <= date.date():
-                applicable_apr = revision['apr']
-            else:
-                break  # Since revisions are sorted, we can stop here
+        ``changed_on`` is the first date whose inputs differ from those of the
+        shown schedule; None calculates the whole schedule again.
+        """
+        try:
+            with profiler.phase('calculate.build_engine'):
+                engine = self.build_engine()
+        except Exception as e:
+            self.summary_text.setText(f"Error in calculation: {str(e)}\n\nPlease check your input values.")
+            return
         
-        return applicable_apr        
+        # A newer calculation makes any one still running stale
+        self.cancel_calculation()
+        
+        previous = self.schedule_model.result if changed_on is not None else None
+        if previous is not None and previous.money != self.money_mode:
+            previous = None
+        worker = CalculationWorker(engine, self.max_schedule_rows, self,
+                                   previous=previous, changed_on=changed_on,
+                                   cache=self.schedule_cache, money=self.money_mode)
+        worker.progress.connect(self.calc_progress.setValue)
+        worker.succeeded.connect(self.on_calculation_finished)
+        worker.failed.connect(self.on_calculation_failed)
+        worker.finished.connect(worker.deleteLater)
+        self.calc_worker = worker
+        
+        self.calc_progress.setValue(0)
+        self.calc_progress.show()
+        self.cancel_calc_btn.show()
+        worker.start()
+    
+    def cancel_calculation(self):
+        """Stop the running calculation, keeping the schedule shown before it"""
+        if self.calc_worker is not None:
+            self.calc_worker.cancel()
+            self.calc_worker = None
+        self.calc_progress.hide()
+        self.cancel_calc_btn.hide()
+    
+    def on_calculation_failed(self, message):
+        """Report an error raised by the current calculation"""
+        if self.sender() is not self.calc_worker:
+            return
+        self.cancel_calculation()
+        self.summary_text.setText(f"Error in calculation: {message}\n\nPlease check your input values.")
+    
+    def on_calculation_finished(self, engine, result):
+        """Show the schedule and summary of the current calculation"""
+        worker = self.sender()
+        if worker is not self.calc_worker:
+            return
+        self.cancel_calculation()
         
-    def calculate(self):
-        """Calculate loan amortization schedule"""
         try:
-            # Get input values
-            loan_amount = float(self.loan_amount.text())
-            base_apr = float(self.apr.text())
-            year_base = int(self.year_base.text())
-            emi_amount = float(self.emi.text())
-            emi_day = int(self.emi_date.text())
-            tenure_months = int(self.loan_tenure.text())
+            unchanged_rows = 0
+            if result is self.schedule_model.result:
+                unchanged_rows = len(result)
+            elif (not worker.cached and worker.previous is not None
+                  and worker.previous is self.schedule_model.result):
+                unchanged_rows = result.reused_rows
+            with profiler.phase('calculate.show_table'):
+                self.schedule_model.set_result(result, unchanged_rows)
+            self.schedule_engine = engine
+            self.schedule_max_rows = worker.max_rows
+            self.schedule_money_mode = worker.money
             
-            start_date = self.loan_start_dt.date()
-            start_datetime = datetime(start_date.year(), start_date.month(), start_date.day())
+            # Update summary
+            loan_amount = engine.loan_amount
+            base_apr = engine.apr
+            emi_amount = engine.emi_amount
+            emi_day = engine.emi_day
+            tenure_months = engine.tenure_months
+            interest_date_value = engine.interest_charged_date
             
-            interest_date_value = self.interest_charged_date.currentText()
+            total_payment = emi_amount * result.emi_count
+            total_prepayment = result.total_prepayment
+            total_bank_charges = sum(charge['amount'] for charge in engine.bank_charges)
+            total_manual_emis = sum(emi['amount'] for emi in engine.manual_emis)
             
-            # Initialize variables
-            remaining_balance = loan_amount
-            cumulative_interest = 0
-            last_interest_debit_row = -1  # Track when last interest was debited
-            total_interest_paid = 0
+            truncation_note = ""
+            if result.truncated:
+                truncation_note = (
+                    f"\n⚠️ Schedule truncated after {result.rows:,} rows (max_schedule_rows);\n"
+                    f"   totals cover only the rows shown, not the full loan tenure.\n"
+                )
             
-            # Clear existing table
-            self.schedule_table.setRowCount(0)
-            
-            # Calculate end date based on tenure
-            end_date = start_datetime + relativedelta(months=tenure_months)
-            
-            # Generate date-wise amortization schedule
-            current_date = start_datetime
-            row = 0
-            emi_count = 0
-            interest_debit_count = 0
-            
-            while current_date < end_date and remaining_balance > 0.01:
-                # Add row to table
-                self.schedule_table.insertRow(row)
-                
-                # Calculate Beginning Balance for this row
-                if row == 0:
-                    # First row - use original loan amount
-                    beginning_balance = loan_amount
-                else:
-                    # From second row onwards: Previous Beginning Balance + Misc Charges + Interest Debited - EMI - Prepayment
-                    prev_beginning = float(self.schedule_table.item(row-1, 1).text().replace('₹', '').replace(',', ''))
-                    
-                    prev_misc = 0
-                    if self.schedule_table.item(row-1, 2) and self.schedule_table.item(row-1, 2).text():
-                        prev_misc = float(self.schedule_table.item(row-1, 2).text().replace('₹', '').replace(',', ''))
-                    
-                    prev_interest_debited = 0
-                    if self.schedule_table.item(row-1, 7) and self.schedule_table.item(row-1, 7).text():
-                        prev_interest_debited = float(self.schedule_table.item(row-1, 7).text().replace('₹', '').replace(',', ''))
-                    
-                    prev_emi = 0
-                    if self.schedule_table.item(row-1, 8) and self.schedule_table.item(row-1, 8).text():
-                        prev_emi = float(self.schedule_table.item(row-1, 8).text().replace('₹', '').replace(',', ''))
-                    
-                    prev_prepayment = 0
-                    if self.schedule_table.item(row-1, 9) and self.schedule_table.item(row-1, 9).text():
-                        prev_prepayment = float(self.schedule_table.item(row-1, 9).text().replace('₹', '').replace(',', ''))
-                    
-                    beginning_balance = prev_beginning + prev_misc + prev_interest_debited - prev_emi - prev_prepayment
-                
-                remaining_balance = beginning_balance
-                
-                # Date
-                self.set_table_item(row, 0, current_date.strftime("%d-%m-%Y"))
-                
-                # Beginning Balance
-                self.set_table_item(row, 1, f"₹{beginning_balance:,.2f}")
-                
-                # Misc Charges By Bank - check for any bank charges on this date
-                bank_charge = self.get_bank_charge_for_date(current_date)
-                self.set_table_item(row, 2, f"₹{bank_charge:,.2f}" if bank_charge > 0 else "")
-                
-                # Get applicable APR for current date
-                current_apr = self.get_apr_for_date(current_date)
-                current_daily_rate = current_apr / (year_base * 100)
-                
-                # Interest Rate (Annual)
-                self.set_table_item(row, 3, f"{current_apr}%")
-                
-                # Interest Rate (Daily)
-                self.set_table_item(row, 4, f"{current_daily_rate*100:.6f}%")
-                
-                # Check if this is an EMI date
-                is_emi_date = current_date.day == emi_day
-                
-                # Check if this month is excluded from automatic EMI
-                is_excluded_month = self.is_emi_excluded(current_date)
-                
-                # Get manual EMI for this date
-                manual_emi = self.get_manual_emi_for_date(current_date)
-                
-                # EMI (regular EMI on EMI date if not excluded + any manual EMI)
-                emi_paid = 0
-                if is_emi_date and not is_excluded_month:
-                    emi_paid = emi_amount
-                    emi_count += 1
-                
-                # Add manual EMI
-                emi_paid += manual_emi
-                
-                self.set_table_item(row, 8, f"₹{emi_paid:,.2f}" if emi_paid > 0 else "")
-                
-                # Pre-Payment - check for any prepayments on this date
-                prepayment = self.get_prepayment_for_date(current_date)
-                self.set_table_item(row, 9, f"₹{prepayment:,.2f}" if prepayment > 0 else "")
-                
-                # Calculate adjusted balance for interest calculation
-                # Beginning Balance + Misc Charges - EMI - Prepayment (EXCLUDING Interest Debited)
-                adjusted_balance = beginning_balance + bank_charge - emi_paid - prepayment
-
-                # Interest Amount for Each Day (calculated on adjusted balance, NOT including interest debited)
-                daily_interest = adjusted_balance * current_daily_rate
-                cumulative_interest += daily_interest
-                self.set_table_item(row, 5, f"₹{daily_interest:,.2f}")
-                
-                # Check if this is an interest charged date
-                is_interest_date = False
-                if interest_date_value == "EOM":
-                    # Check if this is the last day of the month
-                    last_day = calendar.monthrange(current_date.year, current_date.month)[1]
-                    is_interest_date = current_date.day == last_day
-                else:
-                    interest_day = int(interest_date_value)
-                    is_interest_date = current_date.day == interest_day
-                
-
-                interest_debited = 0
-                if is_interest_date:
-                    # Sum all daily interest from last debit to current row (including current row)
-                    start_row = last_interest_debit_row + 1
-                    for sum_row in range(start_row, row + 1):  # INCLUDES current row
-                        daily_int_item = self.schedule_table.item(sum_row, 5)  # Column 5 is "Interest Amount for Each Day"
-                        if daily_int_item and daily_int_item.text():
-                            daily_int_value = float(daily_int_item.text().replace('₹', '').replace(',', ''))
-                            interest_debited += daily_int_value
-                    
-                    # Round off to nearest whole number
-                    interest_debited = round(interest_debited, 0)
-                    
-                    if interest_debited > 0:
-                        interest_debit_count += 1
-                        # Update last debit row
-                        last_interest_debit_row = row
-                        
-                self.set_table_item(row, 7, f"₹{interest_debited:,.0f}" if interest_debited > 0 else "")
-                
-                # Interest Paid and Principal Paid calculation
-                total_payment = emi_paid + prepayment
-                interest_paid = 0
-                principal_paid = 0
-                display_cumulative_interest = cumulative_interest  # Store for display before adjustment
-
-                if total_payment > 0:
-                    if total_payment >= cumulative_interest:
-                        # Payment covers all accumulated interest and more
-                        interest_paid = cumulative_interest
-                        principal_paid = total_payment - interest_paid
-                        # Reset cumulative interest to 0 for next row
-                        cumulative_interest = 0
-                    else:
-                        # Payment is less than accumulated interest
-                        interest_paid = total_payment
-                        principal_paid = 0
-                        # Reduce cumulative interest by the amount paid
-                        cumulative_interest = cumulative_interest - interest_paid
-
-                self.set_table_item(row, 10, f"₹{interest_paid:,.2f}" if interest_paid > 0 else "")
-                self.set_table_item(row, 11, f"₹{principal_paid:,.2f}" if principal_paid > 0 else "")
-
-                # Cumulative Interest Accrued (display value BEFORE payment adjustment)
-                # Cumulative Interest Accrued (display value BEFORE payment adjustment)
-                self.set_table_item(row, 6, f"₹{display_cumulative_interest:,.2f}")
-                
-                # Remaining Balance: Beginning Balance + Misc Charges + Interest Debited - EMI - Prepayment
-                remaining_balance = beginning_balance + bank_charge + interest_debited - emi_paid - prepayment
-                self.set_table_item(row, 12, f"₹{remaining_balance:,.2f}")
-                
-                # Balance + Interest Due (balance + cumulative interest after any payments)
-                balance_plus_interest = remaining_balance + cumulative_interest
-                self.set_table_item(row, 13, f"₹{balance_plus_interest:,.2f}")
-                
-                # Total Interest Paid (add current row's interest paid)
-                if interest_paid > 0:
-                    total_interest_paid += interest_paid
-                self.set_table_item(row, 14, f"₹{total_interest_paid:,.2f}")
-                
-                # Color code rows
-                if bank_charge > 0:
-                    # Orange for bank charge dates
-                    for col in range(15):
-                        item = self.schedule_table.item(row, col)
-                        if item:
-                            item.setBackground(QColor("#ffe6cc"))
-                elif prepayment > 0:
-                    # Purple for prepayment dates
-                    for col in range(15):
-                        item = self.schedule_table.item(row, col)
-                        if item:
-                            item.setBackground(QColor("#f3e5f5"))
-                elif manual_emi > 0 and not is_emi_date:
-                    # Cyan for manual EMI dates (not on regular EMI date)
-                    for col in range(15):
-                        item = self.schedule_table.item(row, col)
-                        if item:
-                            item.setBackground(QColor("#e0f7fa"))
-                elif is_emi_date and is_excluded_month:
-                    # Light gray for excluded EMI dates
-                    for col in range(15):
-                        item = self.schedule_table.item(row, col)
-                        if item:
-                            item.setBackground(QColor("#f5f5f5"))
-                elif is_interest_date and interest_debited > 0:
-                    # Yellow for interest charged dates
-                    for col in range(15):
-                        item = self.schedule_table.item(row, col)
-                        if item:
-                            item.setBackground(QColor("#fff9e6"))
-                elif is_emi_date and emi_paid > 0:
-                    # Green for EMI payment rows
-                    for col in range(15):
-                        item = self.schedule_table.item(row, col)
-                        if item:
-                            item.setBackground(QColor("#e8f8f5"))
-                
-                # Move to next day
-                current_date += timedelta(days=1)
-                row += 1
-                
-                # Safety break for very long calculations
-                if row > 10000:
-                    break            # Update summary
-            total_payment = emi_amount * emi_count
-            total_prepayment = sum(self.get_prepayment_for_date(start_datetime + timedelta(days=d)) 
-                                  for d in range(row))
-            total_bank_charges = sum(charge['amount'] for charge in self.bank_charges)
-            total_manual_emis = sum(emi['amount'] for emi in self.manual_emis)
+            money_note = ""
+            if result.money == 'paise':
+                money_note = (
+                    "\nAmounts computed in exact paise: daily interest rounded to the paisa,\n"
+                    "   interest debits to the rupee.\n"
+                )
             
             summary = f"""
 ═══════════════════════════════════════════════════════════════
@@ -2077,28 +2191,28 @@ class LoanCalculatorApp(QMainWindow):
 
 Loan Amount              : ₹{loan_amount:,.2f}
 Initial Interest Rate    : {base_apr}%
-Interest Rate Revisions  : {len(self.interest_rate_revisions)}
+Interest Rate Revisions  : {len(engine.interest_rate_revisions)}
 Daily Interest Rate      : Variable (based on revisions)
 EMI Amount               : ₹{emi_amount:,.2f}
 EMI Date (Each Month)    : {emi_day}
-Excluded EMI Months      : {len(self.emi_exclusions)}
+Excluded EMI Months      : {len(engine.emi_exclusions)}
 Interest Charged Date    : {interest_date_value} (each month)
 Loan Tenure              : {tenure_months} months
-Total Days               : {row} days
-Regular EMI Payments     : {emi_count}
-Interest Debits Made     : {interest_debit_count}
-Pre-Payments Added       : {len(self.prepayments)}
-Bank Charges Added       : {len(self.bank_charges)}
-Manual EMIs Added        : {len(self.manual_emis)}
+Total Days               : {result.days} days
+Regular EMI Payments     : {result.emi_count}
+Interest Debits Made     : {result.interest_debit_count}
+Pre-Payments Added       : {len(engine.prepayments)}
+Bank Charges Added       : {len(engine.bank_charges)}
+Manual EMIs Added        : {len(engine.manual_emis)}
 
 Total Regular EMI Paid   : ₹{total_payment:,.2f}
 Total Manual EMI Paid    : ₹{total_manual_emis:,.2f}
 Total Pre-Payments       : ₹{total_prepayment:,.2f}
 Total Bank Charges       : ₹{total_bank_charges:,.2f}
 Total Amount Paid        : ₹{total_payment + total_prepayment + total_manual_emis:,.2f}
-Total Interest Paid      : ₹{total_interest_paid:,.2f}
-Final Remaining Balance  : ₹{remaining_balance:,.2f}
-
+Total Interest Paid      : ₹{result.total_interest_paid:,.2f}
+Final Remaining Balance  : ₹{result.final_balance:,.2f}
+{truncation_note}{money_note}
 Color Legend:
   🟠 Orange = Bank Charge Date
   🟪 Purple = Pre-Payment Date
@@ -2123,7 +2237,8 @@ Note: Interest rates are revised based on the dates specified in revisions
     def export_to_excel(self):
         """Export the amortization schedule to Excel"""
         try:
-            if self.schedule_table.rowCount() == 0:
+            result = self.schedule_model.result
+            if result is None or len(result) == 0:
                 # Show message if no data to export
                 from PyQt6.QtWidgets import QMessageBox
                 QMessageBox.warning(self, "No Data", "Please calculate the loan schedule first before exporting.")
@@ -2131,205 +2246,31 @@ Note: Interest rates are revised based on the dates specified in revisions
             
             # Create file dialog to get save location
             from PyQt6.QtWidgets import QFileDialog
-            file_path, _ = QFileDialog.getSaveFileName(
+            file_path, selected_filter = QFileDialog.getSaveFileName(
                 self,
-                "Save Excel File",
+                "Export Schedule",
                 "loan_schedule.xlsx",
-                "Excel Files (*.xlsx)"
+                "Excel Files (*.xlsx);;CSV Files (*.csv);;Parquet Files (*.parquet);;Arrow IPC Files (*.arrow)"
             )
             
             if not file_path:
                 return  # User cancelled
             
-            # Create workbook and worksheet
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Amortization Schedule"
-            
-            # Define styles
-            header_fill = PatternFill(start_color="3498DB", end_color="3498DB", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=11)
-            
-            # Colors for different row types
-            bank_charge_fill = PatternFill(start_color="FFE6CC", end_color="FFE6CC", fill_type="solid")
-            prepayment_fill = PatternFill(start_color="F3E5F5", end_color="F3E5F5", fill_type="solid")
-            manual_emi_fill = PatternFill(start_color="E0F7FA", end_color="E0F7FA", fill_type="solid")
-            excluded_emi_fill = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
-            interest_date_fill = PatternFill(start_color="FFF9E6", end_color="FFF9E6", fill_type="solid")
-            emi_fill = PatternFill(start_color="E8F8F5", end_color="E8F8F5", fill_type="solid")
-            
-            center_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            right_alignment = Alignment(horizontal="right", vertical="center")
-            
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            # Add summary information at the top
-            loan_amount = float(self.loan_amount.text())
-            base_apr = float(self.apr.text())
-            emi_amount = float(self.emi.text())
-            tenure_months = int(self.loan_tenure.text())
-            
-            ws['A1'] = "LOAN CALCULATION SUMMARY"
-            ws['A1'].font = Font(bold=True, size=14)
-            ws.merge_cells('A1:E1')
-            
-            summary_data = [
-                ["Loan Amount:", f"₹{loan_amount:,.2f}"],
-                ["Initial Interest Rate:", f"{base_apr}%"],
-                ["EMI Amount:", f"₹{emi_amount:,.2f}"],
-                ["Loan Tenure:", f"{tenure_months} months"],
-                ["Total Rows:", str(self.schedule_table.rowCount())],
-            ]
-            
-            row_num = 2
-            for label, value in summary_data:
-                ws[f'A{row_num}'] = label
-                ws[f'A{row_num}'].font = Font(bold=True)
-                ws[f'B{row_num}'] = value
-                row_num += 1
-            
-            # Add blank row
-            row_num += 1
-            
-            # Write headers
-            headers = [
-                "Date", "Beginning Balance", "Misc Charges By Bank", 
-                "Interest Rate (Annual)", "Interest Rate (Daily)", 
-                "Interest Amount for Each Day", "Cumulative Interest Accrued",
-                "Interest Debited By Bank", "EMI", "Pre-Payment",
-                "Interest Paid", "Principal Paid", "Remaining Balance",
-                "Balance + Interest Due", "Total Interest Paid"
-            ]
-            
-            for col_num, header in enumerate(headers, 1):
-                cell = ws.cell(row=row_num, column=col_num)
-                cell.value = header
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = center_alignment
-                cell.border = thin_border
-            
-            header_row = row_num
-            row_num += 1
-            
-            # Write data rows
-            for table_row in range(self.schedule_table.rowCount()):
-                # Get background color from table
-                bg_color = self.schedule_table.item(table_row, 0).background().color()
-                
-                # Determine fill based on color
-                fill = None
-                if bg_color.name() == "#ffe6cc":
-                    fill = bank_charge_fill
-                elif bg_color.name() == "#f3e5f5":
-                    fill = prepayment_fill
-                elif bg_color.name() == "#e0f7fa":
-                    fill = manual_emi_fill
-                elif bg_color.name() == "#f5f5f5":
-                    fill = excluded_emi_fill
-                elif bg_color.name() == "#fff9e6":
-                    fill = interest_date_fill
-                elif bg_color.name() == "#e8f8f5":
-                    fill = emi_fill
-                
-                for col_num in range(15):
-                    item = self.schedule_table.item(table_row, col_num)
-                    cell = ws.cell(row=row_num, column=col_num + 1)
-                    
-                    if item and item.text():
-                        value = item.text()
-                        
-                        # Remove currency symbol and commas for numeric columns
-                        if col_num == 0:  # Date column
-                            cell.value = value
-                            cell.alignment = center_alignment
-                        elif col_num in [3, 4]:  # Percentage columns
-                            cell.value = value
-                            cell.alignment = center_alignment
-                        else:  # Numeric columns
-                            try:
-                                numeric_value = float(value.replace('₹', '').replace(',', '').replace('%', ''))
-                                cell.value = numeric_value
-                                if col_num in [3, 4]:  # Interest rate columns
-                                    cell.number_format = '0.000000"%"'
-                                else:
-                                    cell.number_format = '₹#,##0.00'
-                                cell.alignment = right_alignment
-                            except:
-                                cell.value = value
-                                cell.alignment = center_alignment
-                    
-                    cell.border = thin_border
-                    if fill:
-                        cell.fill = fill
-                
-                row_num += 1
-            
-            # Auto-adjust column widths
-            for col_num in range(1, 16):
-                column_letter = get_column_letter(col_num)
-                max_length = 0
-                
-                # Check header length
-                if ws[f'{column_letter}{header_row}'].value:
-                    max_length = len(str(ws[f'{column_letter}{header_row}'].value))
-                
-                # Check data length (sample first 100 rows for performance)
-                for row in range(header_row + 1, min(header_row + 101, row_num)):
-                    cell_value = ws[f'{column_letter}{row}'].value
-                    if cell_value:
-                        max_length = max(max_length, len(str(cell_value)))
-                
-                adjusted_width = min(max_length + 2, 30)  # Cap at 30
-                ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Freeze panes (freeze header row and first column)
-            ws.freeze_panes = f'B{header_row + 1}'
+            # The file format follows the extension, taken from the chosen filter if missing
+            if not os.path.splitext(file_path)[1] and "(*." in selected_filter:
+                file_path += selected_filter[selected_filter.index("(*.") + 2:-1]
             
-            # Add legend at the bottom
-            row_num += 2
-            ws[f'A{row_num}'] = "COLOR LEGEND:"
-            ws[f'A{row_num}'].font = Font(bold=True)
-            row_num += 1
-            
-            legend_data = [
-                ("Bank Charge Date", bank_charge_fill),
-                ("Pre-Payment Date", prepayment_fill),
-                ("Manual EMI Date", manual_emi_fill),
-                ("Excluded EMI Date", excluded_emi_fill),
-                ("Interest Charged Date", interest_date_fill),
-                ("Regular EMI Payment Date", emi_fill),
-            ]
-            
-            for label, fill_style in legend_data:
-                ws[f'A{row_num}'] = label
-                ws[f'A{row_num}'].fill = fill_style
-                ws[f'A{row_num}'].border = thin_border
-                row_num += 1
-            
-            # Save workbook
-            wb.save(file_path)
+            write_schedule(self.schedule_engine, result, file_path)
             
             # Show success message
             from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.information(self, "Success", f"Excel file saved successfully!\n\n{file_path}")
+            QMessageBox.information(self, "Success", f"Schedule saved successfully!\n\n{file_path}")
             
         except Exception as e:
             from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.critical(self, "Error", f"Failed to export to Excel:\n{str(e)}")
+            QMessageBox.critical(self, "Error", f"Failed to export schedule:\n{str(e)}")
 
             
-    def set_table_item(self, row, col, value):
-        """Helper method to set table item"""
-        item = QTableWidgetItem(value)
-        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.schedule_table.setItem(row, col, item)
-    
     def last_day_of_month(self, date):
         """Get last day of month"""
         next_month = date.replace(day=28) + timedelta(days=4)
@@ -2353,67 +2294,68 @@ Note: Interest rates are revised based on the dates specified in revisions
         self.view_bank_charges_btn.setText("View (0)")
         self.view_manual_emis_btn.setText("View (0)")
         self.exclude_emi_btn.setText("Ex (0)")
+        self.schedule_save()
         self.summary_text.clear()
-        self.schedule_table.setRowCount(0)
+        self.cancel_calculation()
+        self.schedule_model.set_result(None)
+        self.schedule_engine = None
 
     def get_settings_file_path(self):
         """Get the path to the settings file"""
-        app_data_dir = os.path.expanduser("~/.loan_calculator")
+        settings_file = settings_file_path()
+        app_data_dir = os.path.dirname(settings_file)
         if not os.path.exists(app_data_dir):
             os.makedirs(app_data_dir)
-        return os.path.join(app_data_dir, "settings.json")
+        return settings_file
     
-    def save_settings(self):
-        """Save all input fields to a JSON file"""
-        try:
+    def settings_snapshot(self):
+        """Get all input fields and events as a settings dictionary"""
+        with profiler.phase('settings.snapshot'):
             settings = {
+                'version': SETTINGS_VERSION,
                 'loan_amount': self.loan_amount.text(),
                 'apr': self.apr.text(),
                 'year_base': self.year_base.text(),
-                'loan_start_date': self.loan_start_dt.date().toString("dd-MM-yyyy"),
+                'loan_start_date': self.loan_start_dt.date().toString("yyyy-MM-dd"),
                 'emi': self.emi.text(),
                 'emi_date': self.emi_date.text(),
                 'interest_charged_date': self.interest_charged_date.currentText(),
                 'loan_tenure': self.loan_tenure.text(),
-                'prepayments': [
-                    {
-                        'type': pp['type'],
-                        'amount': pp['amount'],
-                        'date': pp.get('date').strftime('%d-%m-%Y') if pp.get('date') else None,
-                        'day': pp.get('day'),
-                        'start_date': pp.get('start_date').strftime('%d-%m-%Y') if pp.get('start_date') else None,
-                        'end_date': pp.get('end_date').strftime('%d-%m-%Y') if pp.get('end_date') else None
-                    }
-                    for pp in self.prepayments
-                ],
-                'bank_charges': [
-                    {
-                        'amount': bc['amount'],
-                        'date': bc['date'].strftime('%d-%m-%Y'),
-                        'description': bc['description']
-                    }
-                    for bc in self.bank_charges
-                ],
-                'manual_emis': [
-                    {
-                        'amount': me['amount'],
-                        'date': me['date'].strftime('%d-%m-%Y'),
-                        'note': me['note']
-                    }
-                    for me in self.manual_emis
-                ],
-                'emi_exclusions': self.emi_exclusions,
-                'interest_rate_revisions': [
-                    {
-                        'apr': rev['apr'],
-                        'date': rev['date'].strftime('%d-%m-%Y')
-                    }
-                    for rev in self.interest_rate_revisions
-                ]
-            }
-            
-            with open(self.get_settings_file_path(), 'w') as f:
-                json.dump(settings, f, indent=4)
+                'max_schedule_rows': self.max_schedule_rows,
+                'money': self.money_mode,
+                'profile': self.profile_name,
+            }
+            settings.update(dump_events(
+                self.prepayments, self.bank_charges, self.manual_emis,
+                self.emi_exclusions, self.interest_rate_revisions
+            ))
+            return settings
+    
+    def schedule_save(self):
+        """Save the settings once edits have paused for a moment"""
+        self.save_timer.start()
+    
+    def save_settings_in_background(self):
+        """Write the current settings from the background writer thread"""
+        try:
+            self.settings_writer.submit(self.write_settings_file, self.settings_snapshot())
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+    
+    def write_settings_file(self, settings):
+        try:
+            write_settings(self.get_settings_file_path(), settings)
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+    
+    def save_settings(self):
+        """Save all input fields to a JSON file, waiting for any background save"""
+        self.save_timer.stop()
+        # A queued background save must not land after this one
+        self.settings_writer.shutdown(wait=True)
+        self.settings_writer = ThreadPoolExecutor(max_workers=1)
+        try:
+            self.write_settings_file(self.settings_snapshot())
         except Exception as e:
             print(f"Error saving settings: {e}")
     
@@ -2424,87 +2366,132 @@ Note: Interest rates are revised based on the dates specified in revisions
             if not os.path.exists(settings_file):
                 return
             
-            with open(settings_file, 'r') as f:
-                settings = json.load(f)
-            
-            # Load basic fields
-            self.loan_amount.setText(settings.get('loan_amount', ''))
-            self.apr.setText(settings.get('apr', ''))
-            self.year_base.setText(settings.get('year_base', ''))
-            self.emi.setText(settings.get('emi', ''))
-            self.emi_date.setText(settings.get('emi_date', ''))
-            self.loan_tenure.setText(settings.get('loan_tenure', ''))
-            
-            # Load loan start date
-            date_str = settings.get('loan_start_date')
-            if date_str:
-                self.loan_start_dt.setDate(QDate.fromString(date_str, "dd-MM-yyyy"))
-            
-            # Load interest charged date
-            interest_date = settings.get('interest_charged_date')
-            if interest_date:
-                self.interest_charged_date.setCurrentText(interest_date)
-            
-            # Load prepayments
-            self.prepayments = []
-            for pp in settings.get('prepayments', []):
-                prepayment = {'type': pp['type'], 'amount': pp['amount']}
-                if pp['type'] == 'single':
-                    prepayment['date'] = datetime.strptime(pp['date'], '%d-%m-%Y')
-                elif pp['type'] == 'recurring':
-                    prepayment['day'] = pp['day']
-                    prepayment['start_date'] = datetime.strptime(pp['start_date'], '%d-%m-%Y')
-                    prepayment['end_date'] = datetime.strptime(pp['end_date'], '%d-%m-%Y') if pp['end_date'] else None
-                self.prepayments.append(prepayment)
-            self.view_prepayments_btn.setText(f"View ({len(self.prepayments)})")
-            
-            # Load bank charges
-            self.bank_charges = []
-            for bc in settings.get('bank_charges', []):
-                self.bank_charges.append({
-                    'amount': bc['amount'],
-                    'date': datetime.strptime(bc['date'], '%d-%m-%Y'),
-                    'description': bc['description']
-                })
-            self.view_bank_charges_btn.setText(f"View ({len(self.bank_charges)})")
-            
-            # Load manual EMIs
-            self.manual_emis = []
-            for me in settings.get('manual_emis', []):
-                self.manual_emis.append({
-                    'amount': me['amount'],
-                    'date': datetime.strptime(me['date'], '%d-%m-%Y'),
-                    'note': me['note']
-                })
-            self.view_manual_emis_btn.setText(f"View ({len(self.manual_emis)})")
-            
-            # Load EMI exclusions
-            self.emi_exclusions = settings.get('emi_exclusions', [])
-            self.exclude_emi_btn.setText(f"Ex ({len(self.emi_exclusions)})")
-            
-            # Load interest rate revisions
-            self.interest_rate_revisions = []
-            for rev in settings.get('interest_rate_revisions', []):
-                self.interest_rate_revisions.append({
-                    'apr': rev['apr'],
-                    'date': datetime.strptime(rev['date'], '%d-%m-%Y')
-                })
-            # Sort by date
-            self.interest_rate_revisions.sort(key=lambda x: x['date'])
-            self.view_rate_revisions_btn.setText(f"View ({len(self.interest_rate_revisions)})")
+            settings = read_settings(settings_file)
+            with profiler.phase('settings.apply'):
+                self.apply_settings(settings)
+            self.profile_name = settings.get('profile')
+            self.update_window_title()
             
         except Exception as e:
             print(f"Error loading settings: {e}")
     
+    def apply_settings(self, settings):
+        """Fill the input fields and event lists from a settings dictionary"""
+        # Load basic fields
+        self.loan_amount.setText(settings.get('loan_amount', ''))
+        self.apr.setText(settings.get('apr', ''))
+        self.year_base.setText(settings.get('year_base', ''))
+        self.emi.setText(settings.get('emi', ''))
+        self.emi_date.setText(settings.get('emi_date', ''))
+        self.loan_tenure.setText(settings.get('loan_tenure', ''))
+        self.max_schedule_rows = settings.get('max_schedule_rows')
+        self.money_mode = settings.get('money') or 'float'
+        
+        # Load loan start date
+        date_str = settings.get('loan_start_date')
+        if date_str:
+            start_date = date_parser(settings)(date_str)
+            self.loan_start_dt.setDate(QDate(start_date.year, start_date.month, start_date.day))
+        
+        # Load interest charged date
+        interest_date = settings.get('interest_charged_date')
+        if interest_date:
+            self.interest_charged_date.setCurrentText(interest_date)
+        
+        # Load prepayments, bank charges, manual EMIs, EMI exclusions
+        # and interest rate revisions
+        events = load_events(settings)
+        self.prepayments = events['prepayments']
+        self.view_prepayments_btn.setText(f"View ({len(self.prepayments)})")
+        self.bank_charges = events['bank_charges']
+        self.view_bank_charges_btn.setText(f"View ({len(self.bank_charges)})")
+        self.manual_emis = events['manual_emis']
+        self.view_manual_emis_btn.setText(f"View ({len(self.manual_emis)})")
+        self.emi_exclusions = events['emi_exclusions']
+        self.exclude_emi_btn.setText(f"Ex ({len(self.emi_exclusions)})")
+        self.interest_rate_revisions = events['interest_rate_revisions']
+        self.view_rate_revisions_btn.setText(f"View ({len(self.interest_rate_revisions)})")
+    
+    def show_diagnostics(self):
+        """Show the panel of profiler phase timings"""
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.refresh()
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+    
+    def update_window_title(self):
+        if self.profile_name:
+            self.setWindowTitle(f"Loan Calculator Pro - {self.profile_name}")
+        else:
+            self.setWindowTitle("Loan Calculator Pro")
+    
+    def get_profile_store(self):
+        """Open the profile database the first time it is needed"""
+        if self.profile_store is None:
+            from profile_store import ProfileStore
+            self.profile_store = ProfileStore()
+        return self.profile_store
+    
+    def save_profile(self):
+        """Save the current inputs and events as a named loan profile"""
+        from PyQt6.QtWidgets import QInputDialog, QMessageBox
+        name, ok = QInputDialog.getText(self, "Save Loan Profile", "Profile name:",
+                                        text=self.profile_name or "")
+        name = name.strip()
+        if not ok or not name:
+            return
+        try:
+            self.get_profile_store().save(name, self.settings_snapshot())
+            self.profile_name = name
+            self.update_window_title()
+            self.schedule_save()
+        except Exception as e:
+            QMessageBox.warning(self, "Save Profile", f"Could not save profile: {e}")
+    
+    def open_profile(self):
+        """Choose a saved loan profile and load it into the inputs"""
+        from PyQt6.QtWidgets import QMessageBox
+        try:
+            dialog = ProfileDialog(self.get_profile_store(), self)
+            if dialog.exec() != QDialog.DialogCode.Accepted or dialog.selected_name() is None:
+                return
+            name = dialog.selected_name()
+            self.apply_settings(self.get_profile_store().load(name))
+            self.profile_name = name
+            self.update_window_title()
+            self.schedule_save()
+        except Exception as e:
+            QMessageBox.warning(self, "Open Profile", f"Could not open profile: {e}")
+    
     def closeEvent(self, event):
         """Override close event to save settings"""
         self.save_settings()
+        # Let cancelled calculations unwind before their threads are destroyed
+        self.cancel_calculation()
+        for worker in self.findChildren(CalculationWorker):
+            worker.cancel()
+            worker.wait()
+        if self.profile_store is not None:
+            self.profile_store.close()
         event.accept()
 
-def main():
-    app = QApplication(sys.argv)
-    font = QFont("Segoe UI", 10)
+def create_application(argv):
+    """Create the QApplication with the application-wide font"""
+    app = QApplication(argv)
+    # Asking for a font family the system lacks makes Qt scan every installed
+    # font for a substitute before the first paint, so Segoe UI is only
+    # requested on Windows
+    if sys.platform == "win32":
+        font = QFont("Segoe UI", 10)
+    else:
+        font = app.font()
+        font.setPointSize(10)
     app.setFont(font)
+    return app
+
+def main():
+    app = create_application(sys.argv)
     window = LoanCalculatorApp()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,749 @@
+"""Headless amortization engine for Loan Calculator Pro.
+
+This module has no PyQt6 dependency so schedules can be computed in batch
+jobs or on servers without a display.  The GUI only renders the
+``ScheduleResult`` produced here.
+"""
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime
+from enum import IntEnum
+from collections import namedtuple
+from itertools import chain, islice
+import calendar
+
+
+class RowKind(IntEnum):
+    """Category of a schedule row, used for colouring and exports"""
+    NORMAL = 0
+    BANK_CHARGE = 1
+    PREPAYMENT = 2
+    MANUAL_EMI = 3
+    EXCLUDED_EMI = 4
+    INTEREST_DEBIT = 5
+    EMI = 6
+
+
+def row_kind(bank_charge, prepayment, manual_emi, emi_paid, is_emi_date,
+             is_excluded_month, is_interest_date, interest_debited):
+    """Get the RowKind of a day from its events, the first match in priority order
+
+    Amounts may be floats, integer paise or Decimals.
+    """
+    if bank_charge > 0:
+        return RowKind.BANK_CHARGE
+    if prepayment > 0:
+        return RowKind.PREPAYMENT
+    if manual_emi > 0 and not is_emi_date:
+        return RowKind.MANUAL_EMI
+    if is_emi_date and is_excluded_month:
+        return RowKind.EXCLUDED_EMI
+    if is_interest_date and interest_debited > 0:
+        return RowKind.INTEREST_DEBIT
+    if is_emi_date and emi_paid > 0:
+        return RowKind.EMI
+    return RowKind.NORMAL
+
+
+def split_payment(total_payment, cumulative_interest, zero=0):
+    """Apply a day's payments to the interest accrued so far, the rest to principal
+
+    Returns (interest paid, principal paid, cumulative interest left).
+    Amounts may be floats, integer paise or Decimals; ``zero`` is the zero
+    of that arithmetic, so the results keep its type.
+    """
+    if total_payment <= 0:
+        return zero, zero, cumulative_interest
+    if total_payment >= cumulative_interest:
+        return cumulative_interest, total_payment - cumulative_interest, zero
+    return total_payment, zero, cumulative_interest - total_payment
+
+
+class CalculationCancelled(Exception):
+    """Raised from a progress callback to abandon a running calculation"""
+
+
+# Column order matches the amortization table in the GUI
+COLUMNS = (
+    'ordinal', 'beginning_balance', 'bank_charge', 'apr', 'daily_rate',
+    'daily_interest', 'cumulative_interest', 'interest_debited', 'emi',
+    'prepayment', 'interest_paid', 'principal_paid', 'remaining_balance',
+    'balance_plus_interest', 'interest_paid_to_date',
+)
+
+
+def _to_date(value):
+    """Normalise a date/datetime to a date"""
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _accrue_idle_days(cumulative_interest, accrued_interest, daily_interest, days):
+    """Add a constant daily interest for a run of idle days to both accumulators
+
+    The interest is worked out once for the whole run, but the additions are
+    replayed day by day so float rounding, and with it the rupee rounding of
+    the next debit, is identical to the daily schedule.
+    """
+    accrual = round(daily_interest, 2)
+    for _ in range(days):
+        cumulative_interest += daily_interest
+        accrued_interest += accrual
+    return cumulative_interest, accrued_interest
+
+
+# One schedule row: the table columns followed by the RowKind
+ScheduleRow = namedtuple('ScheduleRow', COLUMNS + ('kind',))
+
+# A run of idle days sharing one balance and rate, yielded in place of
+# their rows when requested
+IdleRun = namedtuple('IdleRun', (
+    'ordinal', 'days', 'balance', 'apr', 'daily_rate', 'daily_interest',
+    'cumulative_interest', 'interest_paid_to_date',
+))
+
+# Loop state at the start of a day, from which a schedule can be resumed
+Checkpoint = namedtuple('Checkpoint', (
+    'ordinal', 'row', 'days', 'balance', 'carried_balance', 'cumulative_interest', 'accrued_interest',
+    'total_interest_paid', 'total_prepayment', 'emi_count', 'interest_debit_count',
+))
+
+# Days between checkpoints of a schedule
+CHECKPOINT_INTERVAL = 31
+
+
+class ScheduleSummary:
+    """Totals of a schedule, filled in while its rows are produced"""
+
+    def __init__(self):
+        self.rows = 0
+        self.days = 0
+        self.emi_count = 0
+        self.interest_debit_count = 0
+        self.total_interest_paid = 0.0
+        self.total_prepayment = 0.0
+        self.final_balance = 0.0
+        # Set when the row limit stopped the schedule before the loan ended
+        self.truncated = False
+
+
+class ScheduleResult(ScheduleSummary):
+    """Amortization schedule stored as numeric column arrays"""
+
+    def __init__(self):
+        super().__init__()
+        self.ordinal = array('l')
+        for name in COLUMNS[1:]:
+            setattr(self, name, array('d'))
+        self.kind = array('b')
+        # Checkpoint records in date order, filled in by AmortizationEngine.run()
+        self.checkpoints = []
+        self.sparse = False
+        # How amounts were computed: 'float' or 'paise' (see amortization_paise)
+        self.money = 'float'
+        # Leading rows carried over unchanged from an earlier schedule by resume()
+        self.reused_rows = 0
+
+    def __len__(self):
+        return len(self.ordinal)
+
+    def column(self, index):
+        """Get a column array by its table index"""
+        return getattr(self, COLUMNS[index])
+
+    def date_at(self, row):
+        """Get the date of a row"""
+        return date.fromordinal(self.ordinal[row])
+
+    def extend(self, rows):
+        """Append a batch of ScheduleRow tuples"""
+        for name, values in zip(ScheduleRow._fields, zip(*rows)):
+            getattr(self, name).extend(values)
+
+
+def _month_length(year, month):
+    """Get the number of days in a month"""
+    if month == 2:
+        return 29 if calendar.isleap(year) else 28
+    return 30 if month in (4, 6, 9, 11) else 31
+
+
+# Day-of-month and month-end columns of a whole month, by month length
+_MONTH_DAYS = {length: array('b', range(1, length + 1)) for length in (28, 29, 30, 31)}
+_MONTH_ENDS = {length: array('b', [0] * (length - 1) + [1]) for length in (28, 29, 30, 31)}
+
+
+class DayTable:
+    """Calendar facts of every day from a first ordinal up to an end ordinal
+
+    Built once per engine, so the daily loop works on integer ordinals
+    alone: the day of month, the month and whether it is the month's last
+    day are looked up by ``ordinal - first`` instead of creating a date and
+    calling calendar.monthrange every day.
+    """
+
+    def __init__(self, first, end):
+        self.first = first
+        self.end = end
+        # Per day: day of month, index into months, 1 on the last day of a month
+        self.day = array('b')
+        self.month = array('l')
+        self.month_end = array('b')
+        # Per month: (year, month), first ordinal and number of days
+        self.months = []
+        self.month_starts = []
+        self.month_lengths = []
+
+        start = date.fromordinal(first)
+        year, month = start.year, start.month
+        month_start = first - start.day + 1
+        while month_start < end:
+            length = _month_length(year, month)
+            index = len(self.months)
+            self.months.append((year, month))
+            self.month_starts.append(month_start)
+            self.month_lengths.append(length)
+
+            # Slices of per-length templates keep the build at C speed
+            first_day = max(first - month_start, 0)
+            last_day = min(end - month_start, length)
+            self.day.extend(_MONTH_DAYS[length][first_day:last_day])
+            self.month_end.extend(_MONTH_ENDS[length][first_day:last_day])
+            self.month.extend(array('l', (index,)) * (last_day - first_day))
+
+            month_start += length
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+
+    def month_of(self, ordinal):
+        """Get the index into months of the month containing an ordinal"""
+        return self.month[ordinal - self.first]
+
+
+def _sum_by_ordinal(items):
+    """Total event amounts per date ordinal, in list order"""
+    totals = {}
+    for item in items:
+        ordinal = _to_date(item['date']).toordinal()
+        totals[ordinal] = totals.get(ordinal, 0) + item['amount']
+    return totals
+
+
+class EventIndex:
+    """Per-date lookup of prepayments, bank charges, manual EMIs and exclusions
+
+    Single-date events are indexed by date ordinal up front.  Recurring
+    prepayments are expanded one month at a time when a date in that month
+    is looked up; only the latest month is kept, so memory does not grow
+    with the tenure.
+    """
+
+    def __init__(self, prepayments=(), bank_charges=(), manual_emis=(), emi_exclusions=()):
+        self.bank_charges = _sum_by_ordinal(bank_charges)
+        self.manual_emis = _sum_by_ordinal(manual_emis)
+        self.excluded_months = {(exc['year'], exc['month']) for exc in emi_exclusions}
+
+        # Dates of bank charges and manual EMIs grouped by (year, month)
+        self._dated_months = {}
+        for ordinal in list(self.bank_charges) + list(self.manual_emis):
+            day = date.fromordinal(ordinal)
+            self._dated_months.setdefault((day.year, day.month), set()).add(ordinal)
+
+        # Prepayments keep their list position so amounts falling on the same
+        # date are added up in the same order as they were entered
+        self._single_prepayments = {}
+        self._recurring_prepayments = []
+        for position, pp in enumerate(prepayments):
+            if pp['type'] == 'single':
+                day = _to_date(pp['date'])
+                self._single_prepayments.setdefault((day.year, day.month), []).append(
+                    (position, day.toordinal(), pp['amount']))
+            elif pp['type'] == 'recurring':
+                end_date = pp.get('end_date')
+                self._recurring_prepayments.append((
+                    position, pp['day'], pp['amount'],
+                    _to_date(pp['start_date']).toordinal(),
+                    _to_date(end_date).toordinal() if end_date else None,
+                ))
+        self._prepayment_month = None
+        self._prepayment_totals = {}
+
+    def prepayments_in_month(self, year, month):
+        """Get the ordinal -> amount map of all prepayments in a month"""
+        if self._prepayment_month == (year, month):
+            return self._prepayment_totals
+
+        entries = list(self._single_prepayments.get((year, month), ()))
+        days_in_month = calendar.monthrange(year, month)[1]
+        for position, day, amount, start, end in self._recurring_prepayments:
+            if day > days_in_month:
+                continue
+            ordinal = date(year, month, day).toordinal()
+            if start <= ordinal and (end is None or ordinal <= end):
+                entries.append((position, ordinal, amount))
+        entries.sort()
+
+        totals = {}
+        for _, ordinal, amount in entries:
+            totals[ordinal] = totals.get(ordinal, 0) + amount
+        self._prepayment_month = (year, month)
+        self._prepayment_totals = totals
+        return totals
+
+    def event_ordinals(self, year, month):
+        """Get the set of ordinals in a month with any prepayment, charge or manual EMI"""
+        ordinals = set(self.prepayments_in_month(year, month))
+        ordinals.update(self._dated_months.get((year, month), ()))
+        return ordinals
+
+    def prepayment(self, day):
+        """Get total prepayment amount for a specific date"""
+        return self.prepayments_in_month(day.year, day.month).get(day.toordinal(), 0)
+
+    def bank_charge(self, day):
+        """Get total bank charge amount for a specific date"""
+        return self.bank_charges.get(day.toordinal(), 0)
+
+    def manual_emi(self, day):
+        """Get total manual EMI amount for a specific date"""
+        return self.manual_emis.get(day.toordinal(), 0)
+
+    def is_emi_excluded(self, day):
+        """Check if EMI is excluded for this date's month/year"""
+        return (day.year, day.month) in self.excluded_months
+
+
+class RateTimeline:
+    """Piecewise-constant APR over time, built from the base APR and revisions
+
+    Revisions are validated and sorted by effective date; when several
+    revisions share a date the one entered last wins.
+    """
+
+    def __init__(self, base_apr, revisions=()):
+        self.base_apr = self._validate_apr(base_apr)
+
+        changes = {}
+        for revision in sorted(revisions, key=lambda rev: _to_date(rev['date'])):
+            changes[_to_date(revision['date']).toordinal()] = self._validate_apr(revision['apr'])
+
+        # starts[i] is the first ordinal at which aprs[i] applies
+        self.starts = [0] + sorted(changes)
+        self.aprs = [self.base_apr] + [changes[ordinal] for ordinal in self.starts[1:]]
+
+    @staticmethod
+    def _validate_apr(apr):
+        """Convert an APR to float, rejecting negative or non-finite values"""
+        apr = float(apr)
+        if not 0 <= apr < float('inf'):
+            raise ValueError(f"Invalid interest rate: {apr}")
+        return apr
+
+    def __len__(self):
+        return len(self.aprs)
+
+    def apr_at(self, ordinal):
+        """Get the APR in effect on a date ordinal"""
+        return self.aprs[bisect_right(self.starts, ordinal) - 1]
+
+    def segments(self, start, end):
+        """Yield (start, end, apr) stretches of constant APR covering [start, end)"""
+        index = bisect_right(self.starts, start) - 1
+        while start < end:
+            index += 1
+            stretch_end = self.starts[index] if index < len(self.starts) else end
+            stretch_end = min(stretch_end, end)
+            yield start, stretch_end, self.aprs[index - 1]
+            start = stretch_end
+
+
+class AmortizationEngine:
+    """Compute a daily amortization schedule from loan inputs and events"""
+
+    def __init__(self, loan_amount, apr, year_base, start_date, emi_amount,
+                 emi_day, tenure_months, interest_charged_date,
+                 prepayments=None, bank_charges=None, manual_emis=None,
+                 emi_exclusions=None, interest_rate_revisions=None):
+        self.loan_amount = float(loan_amount)
+        self.apr = float(apr)
+        self.year_base = int(year_base)
+        self.start_date = _to_date(start_date)
+        self.emi_amount = float(emi_amount)
+        self.emi_day = int(emi_day)
+        self.tenure_months = int(tenure_months)
+        self.interest_charged_date = str(interest_charged_date)
+        # Day of month interest is debited, or None for end of month
+        self.interest_day = None if self.interest_charged_date == "EOM" else int(self.interest_charged_date)
+
+        self.prepayments = prepayments or []
+        self.bank_charges = bank_charges or []
+        self.manual_emis = manual_emis or []
+        self.emi_exclusions = emi_exclusions or []
+        self.interest_rate_revisions = interest_rate_revisions or []
+
+        self.rates = RateTimeline(self.apr, self.interest_rate_revisions)
+        self._day_table = None
+        self.events = EventIndex(self.prepayments, self.bank_charges,
+                                 self.manual_emis, self.emi_exclusions)
+
+    def inputs(self):
+        """Loan terms and events; engines with equal inputs compute equal schedules"""
+        return (self.loan_amount, self.apr, self.year_base, self.start_date,
+                self.emi_amount, self.emi_day, self.tenure_months,
+                self.interest_charged_date, self.prepayments, self.bank_charges,
+                self.manual_emis, self.emi_exclusions, self.interest_rate_revisions)
+
+    @property
+    def end_date(self):
+        """First date after the loan tenure"""
+        # Imported here as it is only needed once per schedule and slows startup
+        from dateutil.relativedelta import relativedelta
+        return self.start_date + relativedelta(months=self.tenure_months)
+
+    @property
+    def day_table(self):
+        """DayTable of the whole tenure, built on first use"""
+        if self._day_table is None:
+            self._day_table = DayTable(self.start_date.toordinal(), self.end_date.toordinal())
+        return self._day_table
+
+    def event_days(self, start, end):
+        """Yield, in order, the ordinals in [start, end) on which anything happens
+
+        These are the loan start, EMI dates, interest debit dates and the
+        dates of prepayments, bank charges and manual EMIs.
+        """
+        loan_start = self.start_date.toordinal()
+        table = self.day_table
+        if start >= end:
+            return
+        for index in range(table.month_of(start), len(table.months)):
+            month_start = table.month_starts[index]
+            if month_start >= end:
+                return
+            days_in_month = table.month_lengths[index]
+
+            ordinals = self.events.event_ordinals(*table.months[index])
+            if self.emi_day <= days_in_month:
+                ordinals.add(month_start + self.emi_day - 1)
+            interest_day = self.interest_day or days_in_month
+            if interest_day <= days_in_month:
+                ordinals.add(month_start + interest_day - 1)
+            if month_start <= loan_start < month_start + days_in_month:
+                ordinals.add(loan_start)
+
+            for ordinal in sorted(ordinals):
+                if start <= ordinal < end:
+                    yield ordinal
+
+    def run(self, max_rows=None, sparse=False, backend='python', progress=None, money='float'):
+        """Compute the whole schedule and return a ScheduleResult
+
+        With ``sparse`` only the rows of days on which something happens
+        are produced.  ``backend='numpy'`` produces the full daily schedule
+        as NumPy arrays, filling the idle days between events with array
+        operations.  See iter_rows() for ``max_rows``.
+
+        ``money='paise'`` computes in integer paise with the rounding rules
+        of amortization_paise instead of in floats.
+
+        ``progress`` is called every few thousand rows with the fraction of
+        the tenure covered so far; it may raise CalculationCancelled to stop
+        the calculation, which is then re-raised from here.
+        """
+        if money == 'paise':
+            from amortization_paise import run_paise
+            return run_paise(self, max_rows=max_rows, sparse=sparse, backend=backend,
+                             progress=progress)
+        if money != 'float':
+            raise ValueError(f"Unknown money mode: {money}")
+
+        if backend == 'numpy':
+            from amortization_numpy import NumpyScheduleResult
+            result = NumpyScheduleResult()
+            items = self.iter_rows(result, max_rows=max_rows, idle_runs=True)
+            for batch in self._batches(items, progress):
+                for item in batch:
+                    if type(item) is IdleRun:
+                        result.add_idle_run(item)
+                    else:
+                        result.extend((item,))
+            result.finish()
+            return result
+
+        if backend != 'python':
+            raise ValueError(f"Unknown backend: {backend}")
+        result = ScheduleResult()
+        result.sparse = sparse
+        rows = self.iter_rows(result, max_rows=max_rows, sparse=sparse,
+                              checkpoints=result.checkpoints)
+        for batch in self._batches(rows, progress):
+            result.extend(batch)
+        return result
+
+    def resume(self, previous, changed_on, max_rows=None, progress=None):
+        """Recompute a schedule whose inputs changed only on or after ``changed_on``
+
+        ``previous`` is the ScheduleResult of an engine whose inputs match
+        this one's before ``changed_on``, run with the same ``max_rows``.
+        Its rows up to the last checkpoint before that date are kept, and
+        only the rest of the schedule is computed again.  Schedules without
+        checkpoints, such as those in paise, are computed again in full.
+        """
+        changed = _to_date(changed_on).toordinal()
+        starts = [checkpoint.ordinal for checkpoint in previous.checkpoints]
+        index = bisect_right(starts, changed) - 1
+        if index < 0:
+            return self.run(max_rows=max_rows, sparse=previous.sparse, progress=progress,
+                            money=previous.money)
+
+        checkpoint = previous.checkpoints[index]
+        result = ScheduleResult()
+        result.sparse = previous.sparse
+        for name in ScheduleRow._fields:
+            setattr(result, name, getattr(previous, name)[:checkpoint.row])
+        # The resumed loop records the checkpoint it starts from again
+        result.checkpoints = previous.checkpoints[:index]
+        result.reused_rows = checkpoint.row
+
+        rows = self.iter_rows(result, max_rows=max_rows, sparse=previous.sparse,
+                              checkpoints=result.checkpoints, resume=checkpoint)
+        for batch in self._batches(rows, progress):
+            result.extend(batch)
+        return result
+
+    def _batches(self, items, progress, size=4096):
+        """Split a row iterator into lists, reporting progress after each"""
+        first = self.start_date.toordinal()
+        span = max(self.end_date.toordinal() - first, 1)
+        while True:
+            batch = list(islice(items, size))
+            if not batch:
+                return
+            if progress is not None:
+                progress(min((batch[-1].ordinal - first) / span, 1.0))
+            yield batch
+
+    def iter_rows(self, summary=None, max_rows=None, sparse=False, idle_runs=False,
+                  checkpoints=None, resume=None):
+        """Yield the schedule one ScheduleRow at a time
+
+        Rows are produced lazily, so memory stays bounded whatever the
+        tenure.  Totals are kept on ``summary`` (a ScheduleSummary) as the
+        rows are produced.  When ``max_rows`` rows have been produced before
+        the loan ends, the schedule stops and ``summary.truncated`` is set.
+
+        With ``sparse`` only the rows of days on which something happens
+        are produced.  Interest for the idle days in between is worked out
+        once per gap from the balance and the daily rate, and the rows,
+        balances and totals are identical to those of the daily schedule.
+        With ``idle_runs`` those gaps are also yielded, as IdleRun records,
+        and count towards ``max_rows`` as one row per day.
+
+        A Checkpoint is appended to the ``checkpoints`` list about every
+        CHECKPOINT_INTERVAL days.  Passing one of them as ``resume`` starts
+        the schedule from that day, with the balances and totals it holds.
+        """
+        if summary is None:
+            summary = ScheduleSummary()
+        if max_rows is None:
+            max_rows = float('inf')
+
+        remaining_balance = self.loan_amount
+        # Beginning balance of the next day.  The original table carried it
+        # over as the paisa-rounded figures of the day before, so it can be
+        # a few ulps away from remaining_balance
+        carried_balance = self.loan_amount
+        cumulative_interest = 0
+        # Interest accrued (to the paisa) since the last debit by the bank
+        accrued_interest = 0
+        total_interest_paid = 0
+        total_prepayment = 0
+
+        events = self.events
+        first_ordinal = self.start_date.toordinal()
+        end_date = self.end_date
+        # Calendar lookups of the daily loop, by ordinal offset
+        table = self.day_table
+        table_first = table.first
+        days_of_month = table.day
+        month_indexes = table.month
+        month_ends = table.month_end
+        months = table.months
+        bank_charges = events.bank_charges
+        manual_emis = events.manual_emis
+        excluded_months = events.excluded_months
+        emi_day = self.emi_day
+        interest_day = self.interest_day
+        # Prepayments by ordinal of the month being walked
+        prepayment_month = None
+        month_prepayments = None
+        row = 0
+        day_count = 0
+
+        if resume is not None:
+            first_ordinal = resume.ordinal
+            row = resume.row
+            day_count = resume.days
+            remaining_balance = resume.balance
+            carried_balance = resume.carried_balance
+            cumulative_interest = resume.cumulative_interest
+            accrued_interest = resume.accrued_interest
+            total_interest_paid = resume.total_interest_paid
+            total_prepayment = resume.total_prepayment
+            summary.emi_count = resume.emi_count
+            summary.interest_debit_count = resume.interest_debit_count
+        next_checkpoint = first_ordinal
+
+        # Walk the tenure one constant-rate stretch at a time
+        for stretch_start, stretch_end, current_apr in self.rates.segments(
+                first_ordinal, end_date.toordinal()):
+            current_daily_rate = current_apr / (self.year_base * 100)
+            # First day of the stretch not yet accounted for
+            next_ordinal = stretch_start
+
+            if sparse or idle_runs:
+                days = self.event_days(stretch_start, stretch_end)
+            else:
+                days = range(stretch_start, stretch_end)
+
+            # The stretch end closes off any idle days left after the last event
+            for ordinal in chain(days, (stretch_end,)):
+                idle_days = ordinal - next_ordinal
+                while idle_days and remaining_balance > 0.01 and not summary.truncated:
+                    # Nothing changes the balance on idle days, so their
+                    # interest is the same every day, except that the first
+                    # one may still carry a balance a few ulps off the
+                    # paisa-rounded one of the days after it
+                    balance = carried_balance
+                    carried_balance = round(balance, 2)
+                    run_days = idle_days if carried_balance == balance and balance > 0.01 else 1
+                    idle_interest = balance * current_daily_rate
+                    if idle_runs:
+                        if row + run_days > max_rows:
+                            run_days = max_rows - row
+                            summary.truncated = True
+                        if run_days:
+                            yield IdleRun(next_ordinal, run_days, balance, current_apr,
+                                          current_daily_rate, idle_interest, cumulative_interest,
+                                          total_interest_paid)
+                            row += run_days
+                        else:
+                            break
+                    cumulative_interest, accrued_interest = _accrue_idle_days(
+                        cumulative_interest, accrued_interest, idle_interest, run_days)
+                    day_count += run_days
+                    next_ordinal += run_days
+                    idle_days -= run_days
+                    remaining_balance = balance
+
+                if remaining_balance <= 0.01 or ordinal == stretch_end or summary.truncated:
+                    break
+
+                if row >= max_rows:
+                    summary.truncated = True
+                    break
+
+                if checkpoints is not None and ordinal >= next_checkpoint:
+                    checkpoints.append(Checkpoint(
+                        ordinal, row, day_count, remaining_balance, carried_balance, cumulative_interest,
+                        accrued_interest, total_interest_paid, total_prepayment,
+                        summary.emi_count, summary.interest_debit_count))
+                    next_checkpoint = ordinal + CHECKPOINT_INTERVAL
+
+                offset = ordinal - table_first
+                day_of_month = days_of_month[offset]
+                month_index = month_indexes[offset]
+                year_month = months[month_index]
+                if month_index != prepayment_month:
+                    prepayment_month = month_index
+                    month_prepayments = events.prepayments_in_month(*year_month)
+
+                beginning_balance = carried_balance
+
+                bank_charge = bank_charges.get(ordinal, 0)
+
+                is_emi_date = day_of_month == emi_day
+                is_excluded_month = year_month in excluded_months
+                manual_emi = manual_emis.get(ordinal, 0)
+
+                # Regular EMI on EMI date if not excluded, plus any manual EMI
+                emi_paid = 0
+                if is_emi_date and not is_excluded_month:
+                    emi_paid = self.emi_amount
+                    summary.emi_count += 1
+                emi_paid += manual_emi
+
+                prepayment = month_prepayments.get(ordinal, 0)
+                total_prepayment += prepayment
+
+                # Interest accrues on the balance after today's payments and charges,
+                # excluding interest debited today
+                adjusted_balance = beginning_balance + bank_charge - emi_paid - prepayment
+                daily_interest = adjusted_balance * current_daily_rate
+                cumulative_interest += daily_interest
+                accrued_interest += round(daily_interest, 2)
+
+                if interest_day is None:
+                    is_interest_date = month_ends[offset] == 1
+                else:
+                    is_interest_date = day_of_month == interest_day
+                interest_debited = 0
+                if is_interest_date:
+                    # Debit the interest accrued since the last debit, including
+                    # today, rounded to the nearest rupee
+                    interest_debited = round(accrued_interest, 0)
+
+                    if interest_debited > 0:
+                        summary.interest_debit_count += 1
+                        accrued_interest = 0
+
+                # Payments go to accrued interest first, the rest to principal
+                display_cumulative_interest = cumulative_interest
+                interest_paid, principal_paid, cumulative_interest = split_payment(
+                    emi_paid + prepayment, cumulative_interest)
+
+                remaining_balance = beginning_balance + bank_charge + interest_debited - emi_paid - prepayment
+
+                # The next day starts from the figures of this row as the
+                # table showed them, rounded to the paisa
+                carried_balance = round(beginning_balance, 2)
+                if bank_charge > 0:
+                    carried_balance += round(bank_charge, 2)
+                if interest_debited > 0:
+                    carried_balance += interest_debited
+                if emi_paid > 0:
+                    carried_balance -= round(emi_paid, 2)
+                if prepayment > 0:
+                    carried_balance -= round(prepayment, 2)
+
+                if interest_paid > 0:
+                    total_interest_paid += interest_paid
+
+                kind = row_kind(bank_charge, prepayment, manual_emi, emi_paid, is_emi_date,
+                                is_excluded_month, is_interest_date, interest_debited)
+
+                yield ScheduleRow(
+                    ordinal, beginning_balance, bank_charge, current_apr,
+                    current_daily_rate, daily_interest, display_cumulative_interest,
+                    interest_debited, emi_paid, prepayment, interest_paid,
+                    principal_paid, remaining_balance,
+                    remaining_balance + cumulative_interest, total_interest_paid, kind,
+                )
+
+                next_ordinal = ordinal + 1
+                day_count += 1
+                row += 1
+                summary.rows = row
+                summary.days = day_count
+
+            if remaining_balance <= 0.01 or summary.truncated:
+                break
+
+        summary.rows = row
+        summary.days = day_count
+        summary.total_interest_paid = total_interest_paid
+        summary.total_prepayment = total_prepayment
+        summary.final_balance = remaining_balance
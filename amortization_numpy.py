@@ -0,0 +1,105 @@
+"""NumPy backend for the amortization engine.
+
+Only the days on which something happens are stepped through in Python.
+Each run of idle days between them, where the balance and rate stay
+constant, is recorded as a single entry and expanded into daily rows with
+array operations once the schedule is complete.  Requires ``numpy``.
+"""
+from array import array
+
+import numpy as np
+
+from amortization_engine import COLUMNS, ScheduleResult
+from amortization_paise import MONEY_COLUMNS
+
+
+class NumpyScheduleResult(ScheduleResult):
+    """ScheduleResult whose columns are NumPy arrays once finished"""
+
+    def __init__(self):
+        super().__init__()
+        # Positions and lengths of the entries that stand for idle-day runs
+        self._idle_positions = []
+        self._idle_lengths = []
+
+    def add_idle_run(self, run):
+        """Record an IdleRun as one entry, expanded into rows by finish()"""
+        self._idle_positions.append(len(self.ordinal))
+        self._idle_lengths.append(run.days)
+
+        self.ordinal.append(run.ordinal)
+        self.beginning_balance.append(run.balance)
+        self.bank_charge.append(0)
+        self.apr.append(run.apr)
+        self.daily_rate.append(run.daily_rate)
+        self.daily_interest.append(run.daily_interest)
+        # Cumulative interest before the run; finish() accumulates from it
+        self.cumulative_interest.append(run.cumulative_interest)
+        self.interest_debited.append(0)
+        self.emi.append(0)
+        self.prepayment.append(0)
+        self.interest_paid.append(0)
+        self.principal_paid.append(0)
+        self.remaining_balance.append(run.balance)
+        self.balance_plus_interest.append(0)
+        self.interest_paid_to_date.append(run.interest_paid_to_date)
+        self.kind.append(0)
+
+    def finish(self):
+        """Expand the idle-day runs and convert every column to a NumPy array"""
+        entries = {name: np.array(getattr(self, name)) for name in COLUMNS + ('kind',)}
+        lengths = np.ones(len(entries['ordinal']), dtype=np.int64)
+        idle_positions = np.array(self._idle_positions, dtype=np.int64)
+        idle_lengths = np.array(self._idle_lengths, dtype=np.int64)
+        lengths[idle_positions] = idle_lengths
+
+        # Columns that stay constant within a run are simply repeated
+        for name, values in entries.items():
+            setattr(self, name, np.repeat(values, lengths))
+
+        # Dates step by one day within a run
+        run_starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        self.ordinal = self.ordinal + (np.arange(len(self.ordinal)) - run_starts)
+
+        if len(idle_positions):
+            is_idle_row = np.repeat(np.isin(np.arange(len(lengths)), idle_positions), lengths)
+            self._accrue_idle_rows(entries, idle_positions, idle_lengths, is_idle_row)
+
+        self.kind = self.kind.astype(np.int8)
+        self._idle_positions = []
+        self._idle_lengths = []
+
+    def _accrue_idle_rows(self, entries, idle_positions, idle_lengths, is_idle_row):
+        """Fill in the cumulative interest of the expanded idle-day rows"""
+        # Accumulate each run's daily interest along the rows of a padded
+        # matrix; accumulate adds left to right, so the running totals
+        # round exactly as the day-by-day loop does
+        width = int(idle_lengths.max())
+        steps = np.repeat(entries['daily_interest'][idle_positions, None], width + 1, axis=1)
+        steps[:, 0] = entries['cumulative_interest'][idle_positions]
+        cumulative = np.add.accumulate(steps, axis=1)[:, 1:]
+        in_run = np.arange(width) < idle_lengths[:, None]
+
+        self.cumulative_interest[is_idle_row] = cumulative[in_run]
+        self.balance_plus_interest[is_idle_row] = (
+            self.remaining_balance[is_idle_row] + self.cumulative_interest[is_idle_row])
+
+
+class PaiseNumpyScheduleResult(NumpyScheduleResult):
+    """NumpyScheduleResult of the paise engine
+
+    Amounts are collected and expanded as int64 paise, so the running
+    totals of idle days are exact, and converted to rupees by finish().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.money = 'paise'
+        for name in MONEY_COLUMNS:
+            setattr(self, name, array('q'))
+
+    def finish(self):
+        """Expand the idle-day runs and convert the amounts to rupees"""
+        super().finish()
+        for name in MONEY_COLUMNS:
+            setattr(self, name, getattr(self, name) / 100)
@@ -0,0 +1,243 @@
+"""Fixed-point money mode of the amortization engine.
+
+The default engine keeps money in floats and rounds only where the
+original table did, so its figures can drift from a bank statement's by a
+paisa here and there over decades of daily accrual.  In this mode every
+amount is an integer number of paise and each rounding step is explicit:
+
+- Loan amount, EMI, prepayments, bank charges and manual EMIs are rounded
+  to the paisa, half away from zero, before they are used.  Amounts of
+  events on the same date are added after rounding.
+- Daily interest is ``balance * APR / (year base * 100)``, worked out
+  exactly from the APR as written and rounded to the paisa, half away
+  from zero.
+- Cumulative and accrued interest are sums of those daily amounts, so
+  they need no further rounding.
+- The interest debited is the accrued interest rounded to the rupee, half
+  away from zero; a debit that rounds to zero or less leaves the interest
+  accruing, as before.
+- Payments go to cumulative interest first and the rest to principal.
+- The schedule ends when at most one paisa remains.
+
+Columns of the result are in rupees, each the float nearest its exact
+two-decimal amount, so displayed and exported figures are exact and the
+same on every platform.  Idle days are worked out with integer
+multiplication, so sparse and NumPy schedules match the daily one.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from fractions import Fraction
+from itertools import chain
+
+from amortization_engine import (COLUMNS, EventIndex, IdleRun, ScheduleResult, ScheduleRow,
+                                 ScheduleSummary, row_kind, split_payment)
+
+# Columns holding amounts of money; the rest are the date, APR and daily rate
+MONEY_COLUMNS = tuple(name for name in COLUMNS if name not in ('ordinal', 'apr', 'daily_rate'))
+
+
+def to_paise(amount):
+    """Convert a rupee amount to integer paise, rounding half away from zero"""
+    return int(Decimal(repr(float(amount))).scaleb(2).to_integral_value(ROUND_HALF_UP))
+
+
+def _divide_rounded(numerator, denominator):
+    """Divide integers, rounding to the nearest and half away from zero"""
+    quotient = (abs(numerator) * 2 + denominator) // (denominator * 2)
+    return quotient if numerator >= 0 else -quotient
+
+
+def _in_paise(items):
+    """Copy event dictionaries with their amounts in paise"""
+    return [dict(item, amount=to_paise(item['amount'])) for item in items]
+
+
+class PaiseScheduleResult(ScheduleResult):
+    """ScheduleResult of the paise engine, converted to rupees as rows arrive"""
+
+    def __init__(self):
+        super().__init__()
+        self.money = 'paise'
+
+    def extend(self, rows):
+        """Append a batch of ScheduleRow tuples with amounts in paise"""
+        for name, values in zip(ScheduleRow._fields, zip(*rows)):
+            if name in MONEY_COLUMNS:
+                values = [value / 100 for value in values]
+            getattr(self, name).extend(values)
+
+
+def run_paise(engine, max_rows=None, sparse=False, backend='python', progress=None):
+    """Compute the schedule of an engine in paise; see AmortizationEngine.run()"""
+    if backend == 'numpy':
+        from amortization_numpy import PaiseNumpyScheduleResult
+        result = PaiseNumpyScheduleResult()
+        items = iter_paise_rows(engine, result, max_rows=max_rows, idle_runs=True)
+        for batch in engine._batches(items, progress):
+            for item in batch:
+                if type(item) is IdleRun:
+                    result.add_idle_run(item)
+                else:
+                    result.extend((item,))
+        result.finish()
+        return result
+
+    if backend != 'python':
+        raise ValueError(f"Unknown backend: {backend}")
+    result = PaiseScheduleResult()
+    result.sparse = sparse
+    rows = iter_paise_rows(engine, result, max_rows=max_rows, sparse=sparse)
+    for batch in engine._batches(rows, progress):
+        result.extend(batch)
+    return result
+
+
+def iter_paise_rows(engine, summary=None, max_rows=None, sparse=False, idle_runs=False):
+    """Yield the schedule of an engine one ScheduleRow at a time, in paise
+
+    Amount columns of the rows and IdleRun records are integer paise; the
+    APR and daily rate stay floats.  The totals on ``summary`` are set in
+    rupees.  ``max_rows``, ``sparse`` and ``idle_runs`` are as for
+    AmortizationEngine.iter_rows().
+    """
+    if summary is None:
+        summary = ScheduleSummary()
+    if max_rows is None:
+        max_rows = float('inf')
+
+    remaining_balance = to_paise(engine.loan_amount)
+    emi_amount = to_paise(engine.emi_amount)
+    cumulative_interest = 0
+    # Interest accrued since the last debit by the bank
+    accrued_interest = 0
+    total_interest_paid = 0
+    total_prepayment = 0
+
+    events = EventIndex(_in_paise(engine.prepayments), _in_paise(engine.bank_charges),
+                        _in_paise(engine.manual_emis), engine.emi_exclusions)
+    table = engine.day_table
+    table_first = table.first
+    days_of_month = table.day
+    month_indexes = table.month
+    month_ends = table.month_end
+    months = table.months
+    bank_charges = events.bank_charges
+    manual_emis = events.manual_emis
+    excluded_months = events.excluded_months
+    emi_day = engine.emi_day
+    interest_day = engine.interest_day
+    prepayment_month = None
+    month_prepayments = None
+    row = 0
+    day_count = 0
+
+    for stretch_start, stretch_end, current_apr in engine.rates.segments(
+            engine.start_date.toordinal(), engine.end_date.toordinal()):
+        current_daily_rate = current_apr / (engine.year_base * 100)
+        # Daily interest is balance * rate_numerator / rate_denominator paise
+        rate = Fraction(repr(current_apr))
+        rate_numerator = rate.numerator
+        rate_denominator = rate.denominator * engine.year_base * 100
+        next_ordinal = stretch_start
+
+        if sparse or idle_runs:
+            days = engine.event_days(stretch_start, stretch_end)
+        else:
+            days = range(stretch_start, stretch_end)
+
+        for ordinal in chain(days, (stretch_end,)):
+            idle_days = ordinal - next_ordinal
+            if idle_days and remaining_balance > 1:
+                idle_interest = _divide_rounded(remaining_balance * rate_numerator, rate_denominator)
+                if idle_runs and row + idle_days > max_rows:
+                    idle_days = max_rows - row
+                    summary.truncated = True
+                if idle_runs and idle_days:
+                    yield IdleRun(next_ordinal, idle_days, remaining_balance, current_apr,
+                                  current_daily_rate, idle_interest, cumulative_interest,
+                                  total_interest_paid)
+                    row += idle_days
+                cumulative_interest += idle_interest * idle_days
+                accrued_interest += idle_interest * idle_days
+                day_count += idle_days
+
+            if remaining_balance <= 1 or ordinal == stretch_end or summary.truncated:
+                break
+
+            if row >= max_rows:
+                summary.truncated = True
+                break
+
+            offset = ordinal - table_first
+            day_of_month = days_of_month[offset]
+            month_index = month_indexes[offset]
+            year_month = months[month_index]
+            if month_index != prepayment_month:
+                prepayment_month = month_index
+                month_prepayments = events.prepayments_in_month(*year_month)
+
+            beginning_balance = remaining_balance
+            bank_charge = bank_charges.get(ordinal, 0)
+
+            is_emi_date = day_of_month == emi_day
+            is_excluded_month = year_month in excluded_months
+            manual_emi = manual_emis.get(ordinal, 0)
+
+            emi_paid = 0
+            if is_emi_date and not is_excluded_month:
+                emi_paid = emi_amount
+                summary.emi_count += 1
+            emi_paid += manual_emi
+
+            prepayment = month_prepayments.get(ordinal, 0)
+            total_prepayment += prepayment
+
+            adjusted_balance = beginning_balance + bank_charge - emi_paid - prepayment
+            daily_interest = _divide_rounded(adjusted_balance * rate_numerator, rate_denominator)
+            cumulative_interest += daily_interest
+            accrued_interest += daily_interest
+
+            if interest_day is None:
+                is_interest_date = month_ends[offset] == 1
+            else:
+                is_interest_date = day_of_month == interest_day
+            interest_debited = 0
+            if is_interest_date:
+                debit = _divide_rounded(accrued_interest, 100) * 100
+                if debit > 0:
+                    interest_debited = debit
+                    summary.interest_debit_count += 1
+                    accrued_interest = 0
+
+            display_cumulative_interest = cumulative_interest
+            interest_paid, principal_paid, cumulative_interest = split_payment(
+                emi_paid + prepayment, cumulative_interest)
+
+            remaining_balance = beginning_balance + bank_charge + interest_debited - emi_paid - prepayment
+            if interest_paid > 0:
+                total_interest_paid += interest_paid
+
+            kind = row_kind(bank_charge, prepayment, manual_emi, emi_paid, is_emi_date,
+                            is_excluded_month, is_interest_date, interest_debited)
+
+            yield ScheduleRow(
+                ordinal, beginning_balance, bank_charge, current_apr,
+                current_daily_rate, daily_interest, display_cumulative_interest,
+                interest_debited, emi_paid, prepayment, interest_paid,
+                principal_paid, remaining_balance,
+                remaining_balance + cumulative_interest, total_interest_paid, kind,
+            )
+
+            next_ordinal = ordinal + 1
+            day_count += 1
+            row += 1
+            summary.rows = row
+            summary.days = day_count
+
+        if remaining_balance <= 1 or summary.truncated:
+            break
+
+    summary.rows = row
+    summary.days = day_count
+    summary.total_interest_paid = total_interest_paid / 100
+    summary.total_prepayment = total_prepayment / 100
+    summary.final_balance = remaining_balance / 100
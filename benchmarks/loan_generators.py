@@ -0,0 +1,111 @@
+"""Seeded generators of realistic loans for the benchmarks.
+
+Each loan is a settings dictionary in the current settings.json format, so
+it can drive the engine (via ``loan_settings.engine_from_settings``), the
+settings writer and the GUI alike.  The same seed always gives the same
+loan.
+"""
+import random
+from datetime import date
+
+from loan_settings import SETTINGS_VERSION
+
+YEAR_BASES = (365, 360)
+INTEREST_DATES = ('EOM', '1', '5', '10', '15', '28', '30', '31')
+
+
+def annuity_emi(amount, apr, months):
+    """Get the monthly instalment that repays a loan over a number of months"""
+    rate = apr / 1200
+    if rate == 0:
+        return amount / months
+    return amount * rate / (1 - (1 + rate) ** -months)
+
+
+def _date_in(rng, start, months):
+    """Get a random date within ``months`` months of ``start``"""
+    offset = rng.randrange(months)
+    year, month = divmod(start.month - 1 + offset, 12)
+    return date(start.year + year, month + 1, rng.randint(1, 28))
+
+
+def random_loan(seed, tenure_years=None):
+    """Get the settings of a loan generated from ``seed``
+
+    The loan runs 5 to 30 years (or ``tenure_years``), with a floating rate
+    revised every year or two, single and recurring prepayments, occasional
+    bank charges, manual EMIs and skipped EMI months.
+    """
+    rng = random.Random(seed)
+    years = tenure_years or rng.randint(5, 30)
+    months = years * 12
+    amount = rng.randrange(5, 300) * 50000
+    apr = rng.choice((6.75, 7.5, 8.1, 8.65, 9.15, 10.5, 11.25))
+    start = date(rng.randint(2015, 2026), rng.randint(1, 12), rng.randint(1, 28))
+    emi = -(-annuity_emi(amount, apr, months) // 100) * 100
+
+    # Floating rate: revised every 12 to 24 months by up to a percentage point
+    revisions = []
+    revised_on = 0
+    revised_apr = apr
+    while True:
+        revised_on += rng.randint(12, 24)
+        if revised_on >= months:
+            break
+        revised_apr = round(max(4.0, revised_apr + rng.choice((-1, -0.5, -0.25, 0.25, 0.5, 1))), 2)
+        year, month = divmod(start.month - 1 + revised_on, 12)
+        revisions.append({'apr': revised_apr, 'date': date(start.year + year, month + 1, 1).isoformat()})
+
+    prepayments = [
+        {'type': 'single', 'amount': float(rng.randrange(1, 40) * 10000),
+         'date': _date_in(rng, start, months).isoformat()}
+        for _ in range(rng.randint(0, years))
+    ]
+    for _ in range(rng.randint(0, 3)):
+        first = _date_in(rng, start, months)
+        end = _date_in(rng, first, 60) if rng.random() < 0.6 else None
+        prepayments.append({
+            'type': 'recurring', 'amount': float(rng.randrange(1, 20) * 1000),
+            'day': rng.randint(1, 31), 'start_date': first.isoformat(),
+            'end_date': end.isoformat() if end else None,
+        })
+
+    bank_charges = [
+        {'amount': float(rng.randrange(1, 30) * 100), 'date': _date_in(rng, start, months).isoformat(),
+         'description': rng.choice(('Processing fee', 'Insurance', 'Late fee', 'Legal charges'))}
+        for _ in range(rng.randint(0, 6))
+    ]
+    manual_emis = [
+        {'amount': float(emi * rng.choice((0.5, 1, 2))), 'date': _date_in(rng, start, months).isoformat(),
+         'note': 'Paid at branch'}
+        for _ in range(rng.randint(0, 4))
+    ]
+    exclusions = []
+    for _ in range(rng.randint(0, 4)):
+        skipped = _date_in(rng, start, months)
+        exclusion = {'month': skipped.month, 'year': skipped.year}
+        if exclusion not in exclusions:
+            exclusions.append(exclusion)
+
+    return {
+        'version': SETTINGS_VERSION,
+        'loan_amount': str(amount),
+        'apr': str(apr),
+        'year_base': str(rng.choice(YEAR_BASES)),
+        'loan_start_date': start.isoformat(),
+        'emi': str(emi),
+        'emi_date': str(rng.randint(1, 28)),
+        'interest_charged_date': rng.choice(INTEREST_DATES),
+        'loan_tenure': str(months),
+        'max_schedule_rows': None,
+        'prepayments': prepayments,
+        'bank_charges': bank_charges,
+        'manual_emis': manual_emis,
+        'emi_exclusions': exclusions,
+        'interest_rate_revisions': revisions,
+    }
+
+
+def random_loans(count, seed=0, tenure_years=None):
+    """Get ``count`` loans generated from consecutive seeds starting at ``seed``"""
+    return [random_loan(seed + offset, tenure_years) for offset in range(count)]
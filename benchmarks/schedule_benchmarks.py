@@ -0,0 +1,267 @@
+"""Benchmark the schedule engine, table, Excel export and settings files.
+
+Loans come from the seeded generators in loan_generators, so two runs with
+the same ``--seed`` and ``--loans`` time exactly the same work.  Each
+benchmark processes every loan once per repeat and reports the median and
+fastest repeat:
+
+- engine: full daily schedule (python backend)
+- engine_sparse: event rows only
+- engine_numpy: full daily schedule with the NumPy backend
+- engine_paise / engine_paise_numpy: the same in integer paise
+- engine_decimal: the paise rounding rules in decimal.Decimal, for comparison
+- table_render: schedule shown in the GUI table and painted, top and bottom
+- excel_export: schedule written to an .xlsx file
+- settings_save / settings_load: settings.json written and read back
+
+Usage::
+
+    python benchmarks/schedule_benchmarks.py --json before.json
+    python benchmarks/schedule_benchmarks.py --json after.json --compare before.json
+    python benchmarks/schedule_benchmarks.py --only engine engine_sparse --loans 20
+
+Benchmarks whose optional dependency (NumPy, PyQt6, openpyxl) is missing
+are skipped.  The table is painted offscreen unless QT_QPA_PLATFORM is set.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from loan_generators import random_loans
+from loan_settings import (dump_events, engine_from_settings, load_events, read_settings,
+                           write_settings)
+
+
+def bench_engine(loans, workdir):
+    rows = 0
+    for settings in loans:
+        rows += len(engine_from_settings(settings).run())
+    return rows
+
+
+def bench_engine_sparse(loans, workdir):
+    rows = 0
+    for settings in loans:
+        rows += len(engine_from_settings(settings).run(sparse=True))
+    return rows
+
+
+def bench_engine_numpy(loans, workdir):
+    import numpy  # noqa: F401  (skip the benchmark without NumPy)
+    rows = 0
+    for settings in loans:
+        rows += len(engine_from_settings(settings).run(backend='numpy'))
+    return rows
+
+
+def bench_engine_paise(loans, workdir):
+    rows = 0
+    for settings in loans:
+        rows += len(engine_from_settings(settings).run(money='paise'))
+    return rows
+
+
+def bench_engine_paise_numpy(loans, workdir):
+    import numpy  # noqa: F401  (skip the benchmark without NumPy)
+    rows = 0
+    for settings in loans:
+        rows += len(engine_from_settings(settings).run(backend='numpy', money='paise'))
+    return rows
+
+
+def bench_engine_decimal(loans, workdir):
+    from reference_engine import decimal_schedule
+    rows = 0
+    for settings in loans:
+        rows += len(decimal_schedule(engine_from_settings(settings)))
+    return rows
+
+
+class TableBench:
+    """Schedule table of the GUI, painted into an offscreen pixmap"""
+
+    def __init__(self, loans, workdir):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PyQt6.QtWidgets import QApplication, QTableView
+        from Loan_Calculator import ScheduleTableModel
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+        self.model = ScheduleTableModel()
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.resize(1400, 600)
+        self.results = [engine_from_settings(settings).run() for settings in loans]
+
+    def __call__(self, loans, workdir):
+        rows = 0
+        for result in self.results:
+            self.model.set_result(result)
+            self.view.scrollToTop()
+            self.view.grab()
+            self.view.scrollToBottom()
+            self.view.grab()
+            rows += len(result)
+        self.model.set_result(None)
+        return rows
+
+
+class ExcelBench:
+    """Excel export of schedules calculated beforehand"""
+
+    def __init__(self, loans, workdir):
+        import openpyxl  # noqa: F401  (skip the benchmark without openpyxl)
+        self.schedules = []
+        for settings in loans:
+            engine = engine_from_settings(settings)
+            self.schedules.append((engine, engine.run()))
+
+    def __call__(self, loans, workdir):
+        from schedule_export import write_excel
+        rows = 0
+        path = os.path.join(workdir, 'schedule.xlsx')
+        for engine, result in self.schedules:
+            write_excel(engine, result, path)
+            rows += len(result)
+        return rows
+
+
+class SettingsSaveBench:
+    """Settings of each loan dumped from event lists and written atomically"""
+
+    def __init__(self, loans, workdir):
+        self.loans = [(settings, list(load_events(settings).values())) for settings in loans]
+
+    def __call__(self, loans, workdir):
+        path = os.path.join(workdir, 'settings.json')
+        for settings, events in self.loans:
+            saved = dict(settings)
+            saved.update(dump_events(*events))
+            write_settings(path, saved)
+        return 0
+
+
+class SettingsLoadBench:
+    """Settings file of each loan read and its events parsed"""
+
+    def __init__(self, loans, workdir):
+        self.paths = []
+        for number, settings in enumerate(loans):
+            path = os.path.join(workdir, f'settings-{number}.json')
+            write_settings(path, settings)
+            self.paths.append(path)
+
+    def __call__(self, loans, workdir):
+        for path in self.paths:
+            load_events(read_settings(path))
+        return 0
+
+
+# Benchmark name -> function, or class built once with the loans before timing
+BENCHMARKS = {
+    'engine': bench_engine,
+    'engine_sparse': bench_engine_sparse,
+    'engine_numpy': bench_engine_numpy,
+    'engine_paise': bench_engine_paise,
+    'engine_paise_numpy': bench_engine_paise_numpy,
+    'engine_decimal': bench_engine_decimal,
+    'table_render': TableBench,
+    'excel_export': ExcelBench,
+    'settings_save': SettingsSaveBench,
+    'settings_load': SettingsLoadBench,
+}
+
+
+def run_benchmark(name, loans, repeat, workdir):
+    """Time one benchmark, returning its results dictionary"""
+    benchmark = BENCHMARKS[name]
+    if isinstance(benchmark, type):
+        benchmark = benchmark(loans, workdir)
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = benchmark(loans, workdir)
+        runs.append(time.perf_counter() - start)
+    median = statistics.median(runs)
+    return {
+        'runs': runs,
+        'median': median,
+        'min': min(runs),
+        'per_loan': median / len(loans),
+        'rows': rows,
+    }
+
+
+def environment():
+    """Describe the interpreter, platform and source revision of a run"""
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+            check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'revision': revision,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark schedule calculation, display and export.")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), metavar='NAME',
+                        help="benchmarks to run (default: all); one of " + ", ".join(BENCHMARKS))
+    parser.add_argument('--loans', type=int, default=5, help="number of generated loans")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first generated loan")
+    parser.add_argument('--tenure-years', type=int, help="fix the tenure instead of drawing 5-30 years")
+    parser.add_argument('--repeat', type=int, default=3, help="times each benchmark is run")
+    parser.add_argument('--json', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="show the change against results saved with --json")
+    args = parser.parse_args()
+
+    loans = random_loans(args.loans, args.seed, args.tenure_years)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='loan-bench-')
+    try:
+        for name in args.only or BENCHMARKS:
+            try:
+                results[name] = result = run_benchmark(name, loans, args.repeat, workdir)
+            except ImportError as e:
+                print(f"{name:<18}: skipped ({e})")
+                continue
+            line = (f"{name:<18}: {result['median'] * 1000:9.1f} ms median, "
+                    f"{result['min'] * 1000:9.1f} ms min, {result['per_loan'] * 1000:8.2f} ms/loan")
+            if name in baseline:
+                line += f"  ({result['median'] / baseline[name]['median']:.2f}x baseline)"
+            print(line)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        report = {
+            'environment': environment(),
+            'options': {'loans': args.loans, 'seed': args.seed,
+                        'tenure_years': args.tenure_years, 'repeat': args.repeat},
+            'results': results,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Measure how long Loan Calculator Pro takes to start.
+
+Each run starts a fresh interpreter, so module imports are timed cold, and
+reports the time from process start to:
+
+- imports: PyQt6 and the application module imported
+- window: main window constructed (settings loaded)
+- first_paint: main window painted for the first time
+
+Usage::
+
+    python benchmarks/startup_time.py --runs 10
+    QT_QPA_PLATFORM=offscreen python benchmarks/startup_time.py
+
+Use ``python -X importtime Loan_Calculator.py`` to break the import time
+down by module.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES = ('imports', 'window', 'first_paint', 'process')
+
+
+def measure_child():
+    """Start the application in this process and print its timings as JSON"""
+    start = time.perf_counter()
+    sys.path.insert(0, REPO_DIR)
+
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+    import Loan_Calculator
+    imported = time.perf_counter()
+
+    app = Loan_Calculator.create_application(sys.argv[:1])
+    window = Loan_Calculator.LoanCalculatorApp()
+    constructed = time.perf_counter()
+    timings = {}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and 'first_paint' not in timings:
+                timings['first_paint'] = time.perf_counter() - start
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    paint_filter = FirstPaint()
+    window.installEventFilter(paint_filter)
+    window.show()
+    # Give up if the platform never paints
+    QTimer.singleShot(10000, app.quit)
+    app.exec()
+
+    timings['imports'] = imported - start
+    timings['window'] = constructed - start
+    print(json.dumps(timings))
+
+
+def run_once():
+    """Time one application start in a fresh interpreter"""
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child'],
+        check=True, capture_output=True, text=True
+    ).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings['process'] = time.perf_counter() - started
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure application startup time.")
+    parser.add_argument('--runs', type=int, default=5, help="number of starts to time")
+    parser.add_argument('--json', help="also write the medians to this JSON file")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child()
+        return
+
+    runs = [run_once() for _ in range(args.runs)]
+    medians = {
+        phase: statistics.median(run[phase] for run in runs if phase in run)
+        for phase in PHASES if any(phase in run for run in runs)
+    }
+    for phase in PHASES:
+        if phase in medians:
+            print(f"{phase:<12}: {medians[phase] * 1000:8.1f} ms (median of {args.runs})")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'runs': runs, 'median': medians}, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""Command line interface of Loan Calculator Pro.
+
+Computes schedules from settings files in the format the GUI saves,
+without importing PyQt6, so it runs on servers without a display::
+
+    python loan_calc.py compute --settings settings.json --out schedule.parquet
+    python loan_calc.py batch loans.jsonl --out summaries.jsonl
+
+``compute`` prints the loan summary and writes the schedule in the format
+given by the extension of ``--out`` (.xlsx, .csv, .parquet or .arrow).
+``batch`` summarizes a whole portfolio of loans over a process pool.
+"""
+import argparse
+import json
+import sys
+
+from loan_settings import engine_from_settings, read_settings, settings_file_path
+from profiling import profiler
+
+
+def schedule_summary(engine, result):
+    """Get the headline figures of a computed schedule as a dictionary"""
+    total_regular_emi = engine.emi_amount * result.emi_count
+    total_manual_emi = sum(emi['amount'] for emi in engine.manual_emis)
+    return {
+        'loan_amount': engine.loan_amount,
+        'initial_apr': engine.apr,
+        'emi_amount': engine.emi_amount,
+        'tenure_months': engine.tenure_months,
+        'days': result.days,
+        'rows': result.rows,
+        'emi_count': result.emi_count,
+        'interest_debit_count': result.interest_debit_count,
+        'total_regular_emi': total_regular_emi,
+        'total_manual_emi': total_manual_emi,
+        'total_prepayment': result.total_prepayment,
+        'total_bank_charges': sum(charge['amount'] for charge in engine.bank_charges),
+        'total_paid': total_regular_emi + total_manual_emi + result.total_prepayment,
+        'total_interest_paid': result.total_interest_paid,
+        'final_balance': result.final_balance,
+        'truncated': result.truncated,
+    }
+
+
+def format_summary(summary):
+    """Format a schedule summary as aligned text lines"""
+    lines = [
+        f"Loan Amount              : ₹{summary['loan_amount']:,.2f}",
+        f"Initial Interest Rate    : {summary['initial_apr']}%",
+        f"EMI Amount               : ₹{summary['emi_amount']:,.2f}",
+        f"Loan Tenure              : {summary['tenure_months']} months",
+        f"Total Days               : {summary['days']} days",
+        f"Regular EMI Payments     : {summary['emi_count']}",
+        f"Interest Debits Made     : {summary['interest_debit_count']}",
+        f"Total Regular EMI Paid   : ₹{summary['total_regular_emi']:,.2f}",
+        f"Total Manual EMI Paid    : ₹{summary['total_manual_emi']:,.2f}",
+        f"Total Pre-Payments       : ₹{summary['total_prepayment']:,.2f}",
+        f"Total Bank Charges       : ₹{summary['total_bank_charges']:,.2f}",
+        f"Total Amount Paid        : ₹{summary['total_paid']:,.2f}",
+        f"Total Interest Paid      : ₹{summary['total_interest_paid']:,.2f}",
+        f"Final Remaining Balance  : ₹{summary['final_balance']:,.2f}",
+    ]
+    if summary['truncated']:
+        lines.append(f"Schedule truncated after {summary['rows']:,} rows; totals cover only those rows")
+    return "\n".join(lines)
+
+
+def compute(args):
+    """Run the ``compute`` command"""
+    if args.profile:
+        profiler.enabled = True
+    settings = read_settings(args.settings)
+    engine = engine_from_settings(settings)
+    # Without --max-rows or --money the values saved with the settings apply, as in the GUI
+    max_rows = args.max_rows
+    if max_rows is None:
+        max_rows = settings.get('max_schedule_rows')
+    money = args.money or settings.get('money') or 'float'
+    with profiler.phase('calculate.engine_run'):
+        result = engine.run(max_rows=max_rows, sparse=args.sparse, backend=args.backend,
+                            money=money)
+
+    if args.out:
+        # Exporters are imported only when a schedule is written
+        from schedule_export import write_schedule
+        write_schedule(engine, result, args.out)
+
+    summary = schedule_summary(engine, result)
+    if args.json:
+        print(json.dumps(summary, indent=4))
+    else:
+        print(format_summary(summary))
+    if args.profile:
+        profiler.dump(args.profile)
+    return 0
+
+
+def batch(args):
+    """Run the ``batch`` command"""
+    from portfolio import run_portfolio
+    loans, errors = run_portfolio(args.source, args.out, workers=args.workers,
+                                  chunksize=args.chunksize)
+    print(f"{loans} loans summarized into {args.out}, {errors} with errors")
+    return 0
+
+
+def build_parser():
+    """Create the argument parser of the loan-calc command"""
+    parser = argparse.ArgumentParser(
+        prog='loan-calc',
+        description="Compute loan amortization schedules without the GUI."
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compute_parser = commands.add_parser(
+        'compute', help="compute the schedule of one loan from a settings file")
+    compute_parser.add_argument(
+        '--settings', default=settings_file_path(),
+        help="settings JSON as saved by the GUI (default: %(default)s)")
+    compute_parser.add_argument(
+        '--out', help="write the schedule to this .xlsx, .csv, .parquet or .arrow file")
+    compute_parser.add_argument(
+        '--max-rows', type=int, default=None,
+        help="stop the schedule after this many rows (default: max_schedule_rows of the settings)")
+    compute_parser.add_argument(
+        '--sparse', action='store_true',
+        help="only produce rows for days on which something happens")
+    compute_parser.add_argument(
+        '--backend', choices=('python', 'numpy'), default='python',
+        help="engine backend for full daily schedules")
+    compute_parser.add_argument(
+        '--money', choices=('float', 'paise'), default=None,
+        help="compute in floats as the table always has, or in exact integer paise "
+             "(default: money of the settings, else float)")
+    compute_parser.add_argument(
+        '--json', action='store_true', help="print the summary as JSON")
+    compute_parser.add_argument(
+        '--profile', metavar='FILE', help="time each phase and write the timings to this JSON file")
+    compute_parser.set_defaults(handler=compute)
+
+    batch_parser = commands.add_parser(
+        'batch', help="summarize many loans in parallel")
+    batch_parser.add_argument(
+        'source', help="directory of settings JSON files, or a JSONL file with one loan per line")
+    batch_parser.add_argument(
+        '--out', required=True, help="summary file, written as CSV if it ends in .csv, else JSONL")
+    batch_parser.add_argument(
+        '--workers', type=int, default=None,
+        help="worker processes (default: number of CPUs)")
+    batch_parser.add_argument(
+        '--chunksize', type=int, default=16,
+        help="loans handed to a worker at a time (default: %(default)s)")
+    batch_parser.set_defaults(handler=batch)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"loan-calc: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
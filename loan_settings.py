@@ -0,0 +1,193 @@
+"""Loan inputs in the settings.json format saved by the GUI.
+
+The window keeps its inputs in ``~/.loan_calculator/settings.json``.  The
+helpers here read and write that schema without Qt, so the same file can
+drive the command line tools.
+
+Settings carry a ``version``.  Version 2 files store dates as ISO
+``YYYY-MM-DD`` strings and are written without indentation; files without
+a version are the original format, with ``DD-MM-YYYY`` dates, and are
+still read.
+"""
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from amortization_engine import AmortizationEngine
+from profiling import profiler
+
+SETTINGS_VERSION = 2
+
+# Format of dates in settings files without a version
+DATE_FORMAT = '%d-%m-%Y'
+
+
+def settings_file_path():
+    """Get the path of the GUI's settings file"""
+    return os.path.join(os.path.expanduser("~/.loan_calculator"), "settings.json")
+
+
+def read_settings(path):
+    """Read a settings dictionary from a JSON file"""
+    with profiler.phase('settings.read'), open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_settings(path, settings):
+    """Write a settings dictionary to a JSON file atomically
+
+    The JSON goes to a temporary file in the same directory, which then
+    replaces ``path`` in one step, so a crash or a full disk never leaves
+    a partly written file behind.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with profiler.phase('settings.write'):
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.settings-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(settings, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def parse_date(text):
+    """Parse a date of an unversioned settings file, returning None for an empty one"""
+    return datetime.strptime(text, DATE_FORMAT) if text else None
+
+
+def parse_iso_date(text):
+    """Parse a date of a version 2 settings file, returning None for an empty one"""
+    return datetime.fromisoformat(text) if text else None
+
+
+def date_parser(settings):
+    """Get the date parsing function for the version of a settings dictionary"""
+    return parse_iso_date if settings.get('version', 1) >= 2 else parse_date
+
+
+def format_date(value):
+    """Format a date or datetime for a settings file"""
+    return value.isoformat()[:10] if value else None
+
+
+def dump_events(prepayments, bank_charges, manual_emis, emi_exclusions, interest_rate_revisions):
+    """Get the event lists in settings form, the inverse of load_events()"""
+    with profiler.phase('settings.dump_events'):
+        return _dump_events(prepayments, bank_charges, manual_emis, emi_exclusions,
+                            interest_rate_revisions)
+
+
+def _dump_events(prepayments, bank_charges, manual_emis, emi_exclusions, interest_rate_revisions):
+    stored_prepayments = []
+    for pp in prepayments:
+        prepayment = {'type': pp['type'], 'amount': pp['amount']}
+        if pp['type'] == 'single':
+            prepayment['date'] = format_date(pp['date'])
+        else:
+            prepayment['day'] = pp['day']
+            prepayment['start_date'] = format_date(pp['start_date'])
+            prepayment['end_date'] = format_date(pp.get('end_date'))
+        stored_prepayments.append(prepayment)
+
+    return {
+        'prepayments': stored_prepayments,
+        'bank_charges': [
+            {'amount': bc['amount'], 'date': format_date(bc['date']), 'description': bc['description']}
+            for bc in bank_charges
+        ],
+        'manual_emis': [
+            {'amount': me['amount'], 'date': format_date(me['date']), 'note': me['note']}
+            for me in manual_emis
+        ],
+        'emi_exclusions': [dict(exclusion) for exclusion in emi_exclusions],
+        'interest_rate_revisions': [
+            {'apr': rev['apr'], 'date': format_date(rev['date'])}
+            for rev in interest_rate_revisions
+        ],
+    }
+
+
+def load_events(settings):
+    """Get the prepayment, charge, EMI and rate revision lists of a settings dictionary"""
+    with profiler.phase('settings.load_events'):
+        return _load_events(settings)
+
+
+def _load_events(settings):
+    parse = date_parser(settings)
+    prepayments = []
+    for pp in settings.get('prepayments', []):
+        prepayment = {'type': pp['type'], 'amount': pp['amount']}
+        if pp['type'] == 'single':
+            prepayment['date'] = parse(pp['date'])
+        elif pp['type'] == 'recurring':
+            prepayment['day'] = pp['day']
+            prepayment['start_date'] = parse(pp['start_date'])
+            prepayment['end_date'] = parse(pp.get('end_date'))
+        prepayments.append(prepayment)
+
+    bank_charges = [
+        {
+            'amount': bc['amount'],
+            'date': parse(bc['date']),
+            'description': bc.get('description', '')
+        }
+        for bc in settings.get('bank_charges', [])
+    ]
+
+    manual_emis = [
+        {
+            'amount': me['amount'],
+            'date': parse(me['date']),
+            'note': me.get('note', '')
+        }
+        for me in settings.get('manual_emis', [])
+    ]
+
+    interest_rate_revisions = sorted(
+        (
+            {
+                'apr': rev['apr'],
+                'date': parse(rev['date'])
+            }
+            for rev in settings.get('interest_rate_revisions', [])
+        ),
+        key=lambda x: x['date']
+    )
+
+    return {
+        'prepayments': prepayments,
+        'bank_charges': bank_charges,
+        'manual_emis': manual_emis,
+        'emi_exclusions': list(settings.get('emi_exclusions', [])),
+        'interest_rate_revisions': interest_rate_revisions,
+    }
+
+
+def engine_from_settings(settings):
+    """Create an AmortizationEngine from a settings dictionary
+
+    Raises ValueError naming the first loan field that is missing.
+    """
+    fields = ('loan_amount', 'apr', 'year_base', 'loan_start_date', 'emi',
+              'emi_date', 'interest_charged_date', 'loan_tenure')
+    for field in fields:
+        if settings.get(field) in (None, ''):
+            raise ValueError(f"Settings are missing '{field}'")
+
+    return AmortizationEngine(
+        loan_amount=float(settings['loan_amount']),
+        apr=float(settings['apr']),
+        year_base=int(settings['year_base']),
+        start_date=date_parser(settings)(settings['loan_start_date']),
+        emi_amount=float(settings['emi']),
+        emi_day=int(settings['emi_date']),
+        tenure_months=int(settings['loan_tenure']),
+        interest_charged_date=settings['interest_charged_date'],
+        **load_events(settings)
+    )
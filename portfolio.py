@@ -0,0 +1,131 @@
+"""Batch runs of the amortization engine over a portfolio of loans.
+
+Loans are read from a directory of settings files, one per loan, or from a
+JSONL file with one settings dictionary per line.  They are spread over a
+process pool and one summary per loan is streamed to the output file as
+soon as it is ready, in input order.
+"""
+import csv
+import json
+import os
+from collections import deque
+from multiprocessing import Pool
+
+from amortization_engine import ScheduleSummary
+from loan_settings import engine_from_settings, read_settings
+
+# Fields of each loan's summary, in output order
+SUMMARY_FIELDS = (
+    'loan', 'total_interest_paid', 'final_balance', 'interest_debit_count',
+    'emi_count', 'total_prepayment', 'days', 'truncated', 'error',
+)
+
+
+def iter_loans(source):
+    """Yield (loan id, settings, error) triples from a directory or JSONL file
+
+    Loans in a directory are named after their file; lines of a JSONL file
+    by their 'loan_id' key, or their line number if it has none.  A file or
+    line that cannot be read as a settings dictionary is yielded with None
+    settings and the reason as ``error``, so it does not stop the batch.
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith('.json'):
+                loan_id = os.path.splitext(name)[0]
+                try:
+                    settings = read_settings(os.path.join(source, name))
+                except (OSError, ValueError) as e:
+                    yield loan_id, None, f"{type(e).__name__}: {e}"
+                else:
+                    yield loan_id, settings, None
+        return
+
+    with open(source, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                settings = json.loads(line)
+            except ValueError as e:
+                yield str(line_number), None, f"{type(e).__name__}: {e}"
+                continue
+            if not isinstance(settings, dict):
+                yield str(line_number), None, "Line is not a JSON object"
+                continue
+            yield str(settings.get('loan_id', line_number)), settings, None
+
+
+def summarize_engine(engine, max_rows=None, money='float'):
+    """Compute the totals of an engine's schedule as a ScheduleSummary
+
+    Only event days are stepped through.  The idle days between them still
+    count towards ``max_rows`` one per day, so a row limit stops the
+    schedule on the same day, with the same totals, as it does for
+    AmortizationEngine.run().  ``money`` is 'float' or 'paise', as for
+    AmortizationEngine.run().
+    """
+    summary = ScheduleSummary()
+    if money == 'paise':
+        from amortization_paise import iter_paise_rows
+        rows = iter_paise_rows(engine, summary, max_rows=max_rows, idle_runs=True)
+    elif money == 'float':
+        rows = engine.iter_rows(summary, max_rows=max_rows, idle_runs=True)
+    else:
+        raise ValueError(f"Unknown money mode: {money}")
+    # The rows are consumed as they come, as only the totals are needed
+    deque(rows, maxlen=0)
+    return summary
+
+
+def summarize_loan(loan):
+    """Compute the summary of one (loan id, settings, error) triple
+
+    Errors reading or in a loan's settings are reported in its summary
+    instead of stopping the batch.
+    """
+    loan_id, settings, error = loan
+    if error is not None:
+        return {'loan': loan_id, 'error': error}
+    try:
+        engine = engine_from_settings(settings)
+        summary = summarize_engine(engine, settings.get('max_schedule_rows'),
+                                   settings.get('money') or 'float')
+    except Exception as e:
+        return {'loan': loan_id, 'error': f"{type(e).__name__}: {e}"}
+
+    return {
+        'loan': loan_id,
+        'total_interest_paid': summary.total_interest_paid,
+        'final_balance': summary.final_balance,
+        'interest_debit_count': summary.interest_debit_count,
+        'emi_count': summary.emi_count,
+        'total_prepayment': summary.total_prepayment,
+        'days': summary.days,
+        'truncated': summary.truncated,
+    }
+
+
+def run_portfolio(source, out, workers=None, chunksize=16):
+    """Summarize every loan of ``source`` into ``out`` and return the counts
+
+    ``out`` is written as CSV if it ends in .csv, otherwise as JSONL.
+    ``workers`` defaults to the number of CPUs.  Returns a (loans, errors)
+    tuple.
+    """
+    loans = 0
+    errors = 0
+    as_csv = out.lower().endswith('.csv')
+    with open(out, 'w', newline='', encoding='utf-8') as f, Pool(workers) as pool:
+        if as_csv:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+        for summary in pool.imap(summarize_loan, iter_loans(source), chunksize):
+            loans += 1
+            if 'error' in summary:
+                errors += 1
+            if as_csv:
+                writer.writerow(summary)
+            else:
+                f.write(json.dumps(summary) + "\n")
+    return loans, errors
@@ -0,0 +1,143 @@
+"""Named loan profiles kept in a local SQLite database.
+
+Each saved loan is one row of ``loans`` holding its input fields, with its
+prepayments, bank charges, manual EMIs, EMI exclusions and rate revisions
+as rows of ``events``.  Listing and searching read only the indexed
+``loans`` columns, so the store stays quick with thousands of loans, and a
+loan's events are read only when it is opened.
+
+Profiles are exchanged as settings dictionaries in the current
+settings.json format (see loan_settings).
+"""
+import json
+import os
+import sqlite3
+from collections import namedtuple
+from datetime import datetime
+
+from loan_settings import SETTINGS_VERSION, date_parser, dump_events, format_date, load_events
+
+# Summary of a saved loan, as listed without opening it
+ProfileInfo = namedtuple('ProfileInfo', ('name', 'loan_amount', 'apr', 'tenure_months', 'updated_at'))
+
+# Event lists of a settings dictionary stored as rows of the events table
+EVENT_KINDS = ('prepayments', 'bank_charges', 'manual_emis', 'emi_exclusions', 'interest_rate_revisions')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS loans (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    loan_amount REAL,
+    apr REAL,
+    tenure_months INTEGER,
+    fields TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS loans_updated_at ON loans (updated_at);
+CREATE TABLE IF NOT EXISTS events (
+    loan_id INTEGER NOT NULL REFERENCES loans (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (loan_id, kind, position)
+) WITHOUT ROWID;
+"""
+
+
+def profile_store_path():
+    """Get the path of the default profile database"""
+    return os.path.join(os.path.expanduser("~/.loan_calculator"), "profiles.sqlite3")
+
+
+def _number(value, convert):
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ProfileStore:
+    """Saved loans in an SQLite database, opened on first use"""
+
+    def __init__(self, path=None):
+        self.path = path or profile_store_path()
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def save(self, name, settings):
+        """Save a settings dictionary as the loan ``name``, replacing any loan of that name"""
+        events = dump_events(*load_events(settings).values())
+        fields = {key: value for key, value in settings.items() if key not in EVENT_KINDS}
+        fields['version'] = SETTINGS_VERSION
+        fields['loan_start_date'] = format_date(date_parser(settings)(settings.get('loan_start_date')))
+
+        with self.connection as db:
+            db.execute(
+                "INSERT INTO loans (name, loan_amount, apr, tenure_months, fields, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET loan_amount = excluded.loan_amount,"
+                " apr = excluded.apr, tenure_months = excluded.tenure_months,"
+                " fields = excluded.fields, updated_at = excluded.updated_at",
+                (name, _number(settings.get('loan_amount'), float), _number(settings.get('apr'), float),
+                 _number(settings.get('loan_tenure'), int), json.dumps(fields, separators=(',', ':')),
+                 datetime.now().isoformat(timespec='seconds'))
+            )
+            loan_id = db.execute("SELECT id FROM loans WHERE name = ?", (name,)).fetchone()[0]
+            db.execute("DELETE FROM events WHERE loan_id = ?", (loan_id,))
+            db.executemany(
+                "INSERT INTO events (loan_id, kind, position, data) VALUES (?, ?, ?, ?)",
+                ((loan_id, kind, position, json.dumps(item, separators=(',', ':')))
+                 for kind in EVENT_KINDS for position, item in enumerate(events[kind]))
+            )
+
+    def load(self, name):
+        """Get the settings dictionary of the loan ``name``
+
+        Raises KeyError if there is no such loan.
+        """
+        row = self.connection.execute("SELECT id, fields FROM loans WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        loan_id, fields = row
+        settings = json.loads(fields)
+        for kind in EVENT_KINDS:
+            settings[kind] = []
+        for kind, data in self.connection.execute(
+                "SELECT kind, data FROM events WHERE loan_id = ? ORDER BY kind, position", (loan_id,)):
+            settings[kind].append(json.loads(data))
+        return settings
+
+    def delete(self, name):
+        """Delete the loan ``name`` and its events"""
+        with self.connection as db:
+            db.execute("DELETE FROM loans WHERE name = ?", (name,))
+
+    def search(self, text='', limit=200):
+        """List saved loans whose name contains ``text``, most recently saved first"""
+        pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        rows = self.connection.execute(
+            "SELECT name, loan_amount, apr, tenure_months, updated_at FROM loans"
+            " WHERE name LIKE ? ESCAPE '\\' ORDER BY updated_at DESC, id DESC LIMIT ?",
+            (pattern, limit)
+        )
+        return [ProfileInfo(*row) for row in rows]
+
+    def count(self):
+        """Get the number of saved loans"""
+        return self.connection.execute("SELECT COUNT(*) FROM loans").fetchone()[0]
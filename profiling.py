@@ -0,0 +1,105 @@
+"""Opt-in timing of the phases of calculating, exporting and saving.
+
+Code marks a phase with ``with profiler.phase('export.rows'):``.  While
+the profiler is off, ``phase()`` returns one shared do-nothing context
+manager, so a marked phase costs an attribute check and a method call.
+When it is on, each phase records its call count and total wall time.
+
+Profiling starts off unless the ``LOAN_CALC_PROFILE`` environment variable
+is set; the GUI's diagnostics panel and ``loan-calc compute --profile``
+also switch it on.  Phases are named ``area.step`` and timings from all
+threads are pooled.
+"""
+import json
+import os
+import threading
+import time
+
+
+class _NullPhase:
+    """Context manager of a phase while profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Context manager timing one call of a phase"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """Call counts and wall time of named phases"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        # Phase name -> [calls, total seconds]
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def phase(self, name):
+        """Get a context manager timing the phase ``name`` if profiling is on"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, name, seconds, calls=1):
+        """Add calls and time to a phase"""
+        with self._lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                self.stats[name] = [calls, seconds]
+            else:
+                entry[0] += calls
+                entry[1] += seconds
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+    def report(self):
+        """Get a list of phase dictionaries, ordered by name"""
+        with self._lock:
+            stats = sorted(self.stats.items())
+        return [
+            {'phase': name, 'calls': calls, 'total': total, 'mean': total / calls if calls else 0.0}
+            for name, (calls, total) in stats
+        ]
+
+    def format_report(self):
+        """Format the recorded phases as an aligned text table"""
+        phases = self.report()
+        if not phases:
+            return "No phases recorded."
+        width = max(len('Phase'), max(len(phase['phase']) for phase in phases))
+        lines = [f"{'Phase':<{width}}  {'Calls':>10}  {'Total ms':>12}  {'Mean ms':>12}"]
+        for phase in phases:
+            lines.append(f"{phase['phase']:<{width}}  {phase['calls']:>10,}  "
+                         f"{phase['total'] * 1000:>12.3f}  {phase['mean'] * 1000:>12.4f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Write the recorded phases to a JSON file"""
+        with open(path, 'w') as f:
+            json.dump({'phases': self.report()}, f, indent=4)
+
+
+# Profiler shared by the GUI, the exporters and the command line
+profiler = Profiler(enabled=bool(os.environ.get('LOAN_CALC_PROFILE')))
@@ -0,0 +1,331 @@
+"""Reference implementation of the original daily amortization loop.
+
+This is the loop ``LoanCalculatorApp.calculate()`` ran before the engine
+was split out of the GUI, kept step for step apart from the Qt table.  The
+table held each figure as two-decimal text, and the next row's beginning
+balance and each interest debit were read back from that text, so the
+same round trip is made here through ``_cell()``.  Dates are stepped as
+datetimes and every event lookup scans its whole list, as before.
+
+It is deliberately slow and literal.  Faster engines are checked against
+it with schedule_diff; it is not meant to be optimized.
+
+``decimal_schedule()`` is the counterpart for the paise mode: the rounding
+rules of amortization_paise applied day by day in ``decimal.Decimal``.
+"""
+import calendar
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from amortization_engine import (EventIndex, RowKind, ScheduleResult, ScheduleRow, row_kind,
+                                 split_payment)
+
+PAISA = Decimal('0.01')
+RUPEE = Decimal('1')
+
+
+def _day(value):
+    """Get the date of a date or datetime, as ``.date()`` did on datetimes"""
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _cell(text):
+    """Read an amount back from table text such as ``₹1,234.50``; blank is 0"""
+    return float(text.replace('₹', '').replace(',', '')) if text else 0
+
+
+class ReferenceLoan:
+    """Loan inputs of an AmortizationEngine with the original per-day lookups"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def get_bank_charge_for_date(self, day):
+        total = 0
+        for charge in self.engine.bank_charges:
+            if _day(charge['date']) == day.date():
+                total += charge['amount']
+        return total
+
+    def get_manual_emi_for_date(self, day):
+        total = 0
+        for emi in self.engine.manual_emis:
+            if _day(emi['date']) == day.date():
+                total += emi['amount']
+        return total
+
+    def get_prepayment_for_date(self, day):
+        total = 0
+        for pp in self.engine.prepayments:
+            if pp['type'] == 'single':
+                if _day(pp['date']) == day.date():
+                    total += pp['amount']
+            elif pp['type'] == 'recurring':
+                if _day(pp['start_date']) <= day.date():
+                    if pp.get('end_date') is None or day.date() <= _day(pp['end_date']):
+                        if day.day == pp['day']:
+                            total += pp['amount']
+        return total
+
+    def is_emi_excluded(self, day):
+        for exclusion in self.engine.emi_exclusions:
+            if day.month == exclusion['month'] and day.year == exclusion['year']:
+                return True
+        return False
+
+    def get_apr_for_date(self, day):
+        applicable_apr = self.engine.apr
+        for revision in self.engine.interest_rate_revisions:
+            if _day(revision['date']) <= day.date():
+                applicable_apr = revision['apr']
+            else:
+                break
+        return applicable_apr
+
+
+def reference_schedule(engine, max_rows=None):
+    """Compute the schedule of an engine's inputs with the original loop
+
+    Returns a full daily ScheduleResult.  Values are those the original
+    table showed, read back from their text; ``max_rows`` stops the
+    schedule early as it does for AmortizationEngine.run().
+    """
+    loan = ReferenceLoan(engine)
+    result = ScheduleResult()
+    start_datetime = datetime.combine(engine.start_date, datetime.min.time())
+    end_date = datetime.combine(engine.end_date, datetime.min.time())
+    year_base = engine.year_base
+    emi_amount = engine.emi_amount
+    emi_day = engine.emi_day
+    interest_date_value = engine.interest_charged_date
+
+    remaining_balance = engine.loan_amount
+    cumulative_interest = 0
+    last_interest_debit_row = -1
+    total_interest_paid = 0
+    emi_count = 0
+    interest_debit_count = 0
+
+    # Text of the table cells the loop reads back: per row, the beginning
+    # balance, misc charge, interest debited, EMI and prepayment, and the
+    # daily interest of every row
+    previous_cells = None
+    daily_interest_cells = []
+
+    current_date = start_datetime
+    row = 0
+    while current_date < end_date and remaining_balance > 0.01:
+        if max_rows is not None and row >= max_rows:
+            result.truncated = True
+            break
+
+        if row == 0:
+            beginning_balance = engine.loan_amount
+        else:
+            prev_beginning, prev_misc, prev_debited, prev_emi, prev_prepayment = previous_cells
+            beginning_balance = (_cell(prev_beginning) + _cell(prev_misc) + _cell(prev_debited)
+                                 - _cell(prev_emi) - _cell(prev_prepayment))
+
+        bank_charge = loan.get_bank_charge_for_date(current_date)
+        current_apr = loan.get_apr_for_date(current_date)
+        current_daily_rate = current_apr / (year_base * 100)
+
+        is_emi_date = current_date.day == emi_day
+        is_excluded_month = loan.is_emi_excluded(current_date)
+        manual_emi = loan.get_manual_emi_for_date(current_date)
+
+        emi_paid = 0
+        if is_emi_date and not is_excluded_month:
+            emi_paid = emi_amount
+            emi_count += 1
+        emi_paid += manual_emi
+
+        prepayment = loan.get_prepayment_for_date(current_date)
+
+        adjusted_balance = beginning_balance + bank_charge - emi_paid - prepayment
+        daily_interest = adjusted_balance * current_daily_rate
+        cumulative_interest += daily_interest
+        daily_interest_cells.append(f"₹{daily_interest:,.2f}")
+
+        if interest_date_value == "EOM":
+            last_day = calendar.monthrange(current_date.year, current_date.month)[1]
+            is_interest_date = current_date.day == last_day
+        else:
+            is_interest_date = current_date.day == int(interest_date_value)
+
+        interest_debited = 0
+        if is_interest_date:
+            for sum_row in range(last_interest_debit_row + 1, row + 1):
+                interest_debited += _cell(daily_interest_cells[sum_row])
+            interest_debited = round(interest_debited, 0)
+            if interest_debited > 0:
+                interest_debit_count += 1
+                last_interest_debit_row = row
+
+        total_payment = emi_paid + prepayment
+        interest_paid = 0
+        principal_paid = 0
+        display_cumulative_interest = cumulative_interest
+        if total_payment > 0:
+            if total_payment >= cumulative_interest:
+                interest_paid = cumulative_interest
+                principal_paid = total_payment - interest_paid
+                cumulative_interest = 0
+            else:
+                interest_paid = total_payment
+                principal_paid = 0
+                cumulative_interest = cumulative_interest - interest_paid
+
+        remaining_balance = beginning_balance + bank_charge + interest_debited - emi_paid - prepayment
+        balance_plus_interest = remaining_balance + cumulative_interest
+        if interest_paid > 0:
+            total_interest_paid += interest_paid
+
+        if bank_charge > 0:
+            kind = RowKind.BANK_CHARGE
+        elif prepayment > 0:
+            kind = RowKind.PREPAYMENT
+        elif manual_emi > 0 and not is_emi_date:
+            kind = RowKind.MANUAL_EMI
+        elif is_emi_date and is_excluded_month:
+            kind = RowKind.EXCLUDED_EMI
+        elif is_interest_date and interest_debited > 0:
+            kind = RowKind.INTEREST_DEBIT
+        elif is_emi_date and emi_paid > 0:
+            kind = RowKind.EMI
+        else:
+            kind = RowKind.NORMAL
+
+        previous_cells = (
+            f"₹{beginning_balance:,.2f}",
+            f"₹{bank_charge:,.2f}" if bank_charge > 0 else "",
+            f"₹{interest_debited:,.0f}" if interest_debited > 0 else "",
+            f"₹{emi_paid:,.2f}" if emi_paid > 0 else "",
+            f"₹{prepayment:,.2f}" if prepayment > 0 else "",
+        )
+        result.extend((ScheduleRow(
+            current_date.toordinal(), beginning_balance, bank_charge, current_apr,
+            current_daily_rate, daily_interest, display_cumulative_interest,
+            interest_debited, emi_paid, prepayment, interest_paid, principal_paid,
+            remaining_balance, balance_plus_interest, total_interest_paid, kind,
+        ),))
+
+        current_date += timedelta(days=1)
+        row += 1
+
+    result.rows = row
+    result.days = row
+    result.emi_count = emi_count
+    result.interest_debit_count = interest_debit_count
+    result.total_interest_paid = total_interest_paid
+    result.total_prepayment = sum(
+        loan.get_prepayment_for_date(start_datetime + timedelta(days=d)) for d in range(row))
+    result.final_balance = remaining_balance
+    return result
+
+
+def _money(amount):
+    """Get a rupee amount as a Decimal rounded to the paisa, half away from zero"""
+    return Decimal(repr(float(amount))).quantize(PAISA, ROUND_HALF_UP)
+
+
+def decimal_schedule(engine, max_rows=None):
+    """Compute the paise-mode schedule of an engine's inputs in Decimal
+
+    Returns a full daily ScheduleResult that amortization_paise must match
+    exactly.  Events are looked up through an EventIndex of Decimal
+    amounts, so timing it against the paise engine compares the arithmetic
+    rather than the lookups.
+    """
+    def in_decimal(items):
+        return [dict(item, amount=_money(item['amount'])) for item in items]
+
+    events = EventIndex(in_decimal(engine.prepayments), in_decimal(engine.bank_charges),
+                        in_decimal(engine.manual_emis), engine.emi_exclusions)
+    result = ScheduleResult()
+    result.money = 'paise'
+    year_base = engine.year_base
+    emi_amount = _money(engine.emi_amount)
+
+    remaining_balance = _money(engine.loan_amount)
+    cumulative_interest = Decimal(0)
+    accrued_interest = Decimal(0)
+    total_interest_paid = Decimal(0)
+    total_prepayment = Decimal(0)
+    emi_count = 0
+    interest_debit_count = 0
+
+    ordinal = engine.start_date.toordinal()
+    end = engine.end_date.toordinal()
+    row = 0
+    while ordinal < end and remaining_balance > PAISA:
+        if max_rows is not None and row >= max_rows:
+            result.truncated = True
+            break
+
+        day = datetime.fromordinal(ordinal)
+        beginning_balance = remaining_balance
+        bank_charge = events.bank_charge(day)
+        current_apr = engine.rates.apr_at(ordinal)
+        current_daily_rate = current_apr / (year_base * 100)
+
+        is_emi_date = day.day == engine.emi_day
+        is_excluded_month = events.is_emi_excluded(day)
+        manual_emi = events.manual_emi(day)
+
+        emi_paid = Decimal(0)
+        if is_emi_date and not is_excluded_month:
+            emi_paid = emi_amount
+            emi_count += 1
+        emi_paid += manual_emi
+
+        prepayment = events.prepayment(day)
+        total_prepayment += prepayment
+
+        adjusted_balance = beginning_balance + bank_charge - emi_paid - prepayment
+        daily_interest = (adjusted_balance * Decimal(repr(current_apr)) / (year_base * 100)).quantize(
+            PAISA, ROUND_HALF_UP)
+        cumulative_interest += daily_interest
+        accrued_interest += daily_interest
+
+        if engine.interest_day is None:
+            is_interest_date = day.day == calendar.monthrange(day.year, day.month)[1]
+        else:
+            is_interest_date = day.day == engine.interest_day
+        interest_debited = Decimal(0)
+        if is_interest_date:
+            debit = accrued_interest.quantize(RUPEE, ROUND_HALF_UP)
+            if debit > 0:
+                interest_debited = debit
+                interest_debit_count += 1
+                accrued_interest = Decimal(0)
+
+        display_cumulative_interest = cumulative_interest
+        interest_paid, principal_paid, cumulative_interest = split_payment(
+            emi_paid + prepayment, cumulative_interest, Decimal(0))
+
+        remaining_balance = beginning_balance + bank_charge + interest_debited - emi_paid - prepayment
+        if interest_paid > 0:
+            total_interest_paid += interest_paid
+
+        kind = row_kind(bank_charge, prepayment, manual_emi, emi_paid, is_emi_date,
+                        is_excluded_month, is_interest_date, interest_debited)
+
+        result.extend((ScheduleRow(
+            ordinal, float(beginning_balance), float(bank_charge), current_apr,
+            current_daily_rate, float(daily_interest), float(display_cumulative_interest),
+            float(interest_debited), float(emi_paid), float(prepayment), float(interest_paid),
+            float(principal_paid), float(remaining_balance),
+            float(remaining_balance + cumulative_interest), float(total_interest_paid), kind,
+        ),))
+        ordinal += 1
+        row += 1
+
+    result.rows = row
+    result.days = row
+    result.emi_count = emi_count
+    result.interest_debit_count = interest_debit_count
+    result.total_interest_paid = float(total_interest_paid)
+    result.total_prepayment = float(total_prepayment)
+    result.final_balance = float(remaining_balance)
+    return result
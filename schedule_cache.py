@@ -0,0 +1,92 @@
+"""Cache of computed schedules keyed by a fingerprint of their inputs.
+
+Calculating the same loan twice, or flipping back to a what-if variant
+tried a moment ago, returns the earlier ``ScheduleResult`` instead of
+running the engine again.  Entries are evicted least recently used first
+once the cached schedules pass a memory budget.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from amortization_engine import COLUMNS
+
+# Approximate bytes held per schedule row: a double for each column and the row kind
+ROW_BYTES = 8 * len(COLUMNS) + 1
+
+
+def _encode(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot fingerprint {type(value).__name__}")
+
+
+def input_fingerprint(engine):
+    """Get a stable hex digest of an engine's loan terms and event lists
+
+    Engines with the same fingerprint compute the same schedule.  Events
+    are hashed in list order, as the order of same-day amounts can change
+    the last bit of a sum.
+    """
+    text = json.dumps(engine.inputs(), sort_keys=True, separators=(',', ':'), default=_encode)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class ScheduleCache:
+    """Least recently used cache of schedule results, bounded by memory
+
+    ``max_bytes`` bounds the estimated size of the cached schedules and
+    ``max_entries`` their number.  The cache is safe to share between the
+    GUI thread and calculation threads.  Cached results are shared, so
+    callers must not modify them.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=32):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(engine, max_rows=None, sparse=False, backend='python', money='float'):
+        """Get the cache key of a calculation"""
+        return (input_fingerprint(engine), max_rows, sparse, backend, money)
+
+    def get(self, key):
+        """Get the cached result for a key, or None"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        """Cache a result, evicting the least recently used ones over budget"""
+        size = len(result) * ROW_BYTES
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous) * ROW_BYTES
+            self._entries[key] = result
+            self.size += size
+            while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted) * ROW_BYTES
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
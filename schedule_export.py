@@ -0,0 +1,286 @@
+"""Export of amortization schedules to files.
+
+Exports read the typed columns of a ``ScheduleResult`` and its ``RowKind``
+flags directly, at full precision, so they need no PyQt6 and can run from
+scripts and scheduled jobs.  The display formatting shared with the GUI
+table lives here too.
+
+Besides the styled Excel workbook, schedules can be written as plain CSV,
+Apache Arrow IPC and Parquet for loading into pandas or DuckDB.  The Arrow
+and Parquet writers require ``pyarrow``.
+"""
+import csv
+import os
+from datetime import date
+
+from amortization_engine import COLUMNS, RowKind
+from profiling import profiler
+
+# Column names of the CSV, Arrow and Parquet exports
+DATA_COLUMNS = ('date',) + COLUMNS[1:] + ('kind',)
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Background colours for schedule rows by category
+ROW_COLORS = {
+    RowKind.BANK_CHARGE: "#ffe6cc",
+    RowKind.PREPAYMENT: "#f3e5f5",
+    RowKind.MANUAL_EMI: "#e0f7fa",
+    RowKind.EXCLUDED_EMI: "#f5f5f5",
+    RowKind.INTEREST_DEBIT: "#fff9e6",
+    RowKind.EMI: "#e8f8f5",
+}
+
+# Legend labels of the row colours, in the order they are listed
+ROW_LEGEND = (
+    ("Bank Charge Date", RowKind.BANK_CHARGE),
+    ("Pre-Payment Date", RowKind.PREPAYMENT),
+    ("Manual EMI Date", RowKind.MANUAL_EMI),
+    ("Excluded EMI Date", RowKind.EXCLUDED_EMI),
+    ("Interest Charged Date", RowKind.INTEREST_DEBIT),
+    ("Regular EMI Payment Date", RowKind.EMI),
+)
+
+EXPORT_HEADERS = (
+    "Date", "Beginning Balance", "Misc Charges By Bank",
+    "Interest Rate (Annual)", "Interest Rate (Daily)",
+    "Interest Amount for Each Day", "Cumulative Interest Accrued",
+    "Interest Debited By Bank", "EMI", "Pre-Payment",
+    "Interest Paid", "Principal Paid", "Remaining Balance",
+    "Balance + Interest Due", "Total Interest Paid",
+)
+
+# Columns left blank unless positive
+OPTIONAL_COLUMNS = frozenset((2, 7, 8, 9, 10, 11))
+
+
+def _money(value):
+    return f"₹{value:,.2f}"
+
+
+def _money_if_positive(value):
+    return f"₹{value:,.2f}" if value > 0 else ""
+
+
+# Display formatting of each amortization table column
+SCHEDULE_FORMATTERS = (
+    lambda value: date.fromordinal(int(value)).strftime("%d-%m-%Y"),
+    _money,
+    _money_if_positive,
+    lambda value: f"{value}%",
+    lambda value: f"{value*100:.6f}%",
+    _money,
+    _money,
+    lambda value: f"₹{value:,.0f}" if value > 0 else "",
+    _money_if_positive,
+    _money_if_positive,
+    _money_if_positive,
+    _money_if_positive,
+    _money,
+    _money,
+    _money,
+)
+
+
+def write_excel(engine, result, path):
+    """Write a schedule and its loan summary to an .xlsx file
+
+    ``result`` is the ScheduleResult computed by ``engine``.  The workbook is
+    written in openpyxl's write-only mode, so rows go to the file as they
+    are produced and memory stays flat however long the schedule is.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Amortization Schedule")
+
+    thin_border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    center_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    right_alignment = Alignment(horizontal="right", vertical="center")
+
+    # Named styles are stored once in the workbook and shared by every cell
+    wb.add_named_style(NamedStyle(name="summary_title", font=Font(bold=True, size=14)))
+    wb.add_named_style(NamedStyle(name="summary_label", font=Font(bold=True)))
+    wb.add_named_style(NamedStyle(
+        name="schedule_header",
+        font=Font(bold=True, color="FFFFFF", size=11),
+        fill=PatternFill(start_color="3498DB", end_color="3498DB", fill_type="solid"),
+        alignment=center_alignment,
+        border=thin_border
+    ))
+
+    # Number format and alignment of each kind of column
+    cell_formats = {
+        'date': ('DD-MM-YYYY', center_alignment),
+        'apr': ('General"%"', center_alignment),
+        'rate': ('0.000000"%"', center_alignment),
+        'money': ('₹#,##0.00', right_alignment),
+    }
+    for kind in RowKind:
+        color = ROW_COLORS.get(kind)
+        fill = PatternFill()
+        if color:
+            fill = PatternFill(start_color=color[1:].upper(), end_color=color[1:].upper(), fill_type="solid")
+            wb.add_named_style(NamedStyle(name=f"legend_{kind.name.lower()}", fill=fill, border=thin_border))
+        for cell_format, (number_format, alignment) in cell_formats.items():
+            wb.add_named_style(NamedStyle(
+                name=f"{kind.name.lower()}_{cell_format}",
+                number_format=number_format,
+                alignment=alignment,
+                border=thin_border,
+                fill=fill
+            ))
+
+    column_formats = ['date', 'money', 'money', 'apr', 'rate'] + ['money'] * 10
+
+    # Column widths and frozen panes must be set before any row is written;
+    # widths are sized from the header and the first 100 rows, capped at 30
+    header_row = 8
+    with profiler.phase('export.column_widths'):
+        for col_num, header in enumerate(EXPORT_HEADERS):
+            max_length = len(header)
+            for row in range(min(len(result), 100)):
+                max_length = max(max_length, len(SCHEDULE_FORMATTERS[col_num](result.column(col_num)[row])))
+            ws.column_dimensions[get_column_letter(col_num + 1)].width = min(max_length + 2, 30)
+    ws.freeze_panes = f'B{header_row + 1}'
+
+    # Looking a named style up by name is slow, so each style is resolved
+    # once on a template cell and its style ids reused
+    templates = {}
+
+    def styled(value, style):
+        template = templates.get(style)
+        if template is None:
+            template = templates[style] = WriteOnlyCell(ws)
+            template.style = style
+        cell = WriteOnlyCell(ws, value=value)
+        cell._style = template._style
+        return cell
+
+    # Add summary information at the top
+    ws.append([styled("LOAN CALCULATION SUMMARY", "summary_title")])
+    ws.merged_cells.add('A1:E1')
+
+    summary_data = [
+        ["Loan Amount:", f"₹{engine.loan_amount:,.2f}"],
+        ["Initial Interest Rate:", f"{engine.apr}%"],
+        ["EMI Amount:", f"₹{engine.emi_amount:,.2f}"],
+        ["Loan Tenure:", f"{engine.tenure_months} months"],
+        ["Total Rows:", str(len(result))],
+    ]
+    for label, value in summary_data:
+        ws.append([styled(label, "summary_label"), value])
+
+    # Add blank row
+    ws.append([])
+    ws.append([styled(header, "schedule_header") for header in EXPORT_HEADERS])
+
+    # Write data rows straight from the result's numeric columns
+    columns = [result.column(col_num) for col_num in range(len(EXPORT_HEADERS))]
+    row_styles = {
+        kind: [f"{kind.name.lower()}_{cell_format}" for cell_format in column_formats]
+        for kind in RowKind
+    }
+    with profiler.phase('export.rows'):
+        for row in range(len(result)):
+            styles = row_styles[result.kind[row]]
+            cells = []
+            for col_num, values in enumerate(columns):
+                value = values[row]
+                if col_num == 0:
+                    value = date.fromordinal(int(value))
+                elif col_num == 4:
+                    value = value * 100
+                elif col_num in OPTIONAL_COLUMNS and value <= 0:
+                    value = None
+                cells.append(styled(value, styles[col_num]))
+            ws.append(cells)
+
+    # Add legend at the bottom
+    ws.append([])
+    ws.append([styled("COLOR LEGEND:", "summary_label")])
+    for label, kind in ROW_LEGEND:
+        ws.append([styled(label, f"legend_{kind.name.lower()}")])
+
+    with profiler.phase('export.save'):
+        wb.save(path)
+
+
+def write_csv(result, path):
+    """Write a schedule as CSV with one column per DATA_COLUMNS name
+
+    Dates are ISO formatted, amounts and rates keep full precision and the
+    row kind is written by name.  Rows are streamed to the file.
+    """
+    columns = [result.column(index) for index in range(1, len(COLUMNS))]
+    kind_names = {kind.value: kind.name for kind in RowKind}
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(DATA_COLUMNS)
+        for row, ordinal in enumerate(result.ordinal):
+            writer.writerow([date.fromordinal(int(ordinal)).isoformat()]
+                            + [repr(float(values[row])) for values in columns]
+                            + [kind_names[int(result.kind[row])]])
+
+
+def schedule_table(result):
+    """Build a pyarrow Table of a schedule
+
+    ``date`` is a date32 column, amounts and rates are float64 and ``kind``
+    is dictionary encoded with the RowKind names, which pandas reads as a
+    categorical.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    rows = len(result)
+    days = pc.subtract(pa.array(result.ordinal, pa.int64()), _EPOCH_ORDINAL)
+    arrays = [days.cast(pa.int32()).cast(pa.date32())]
+    for index in range(1, len(COLUMNS)):
+        # The columns are contiguous doubles, so Arrow can use their memory as is
+        arrays.append(pa.Array.from_buffers(
+            pa.float64(), rows, [None, pa.py_buffer(result.column(index))]))
+    kinds = pa.Array.from_buffers(pa.int8(), rows, [None, pa.py_buffer(result.kind)])
+    arrays.append(pa.DictionaryArray.from_arrays(kinds, [kind.name for kind in RowKind]))
+    return pa.Table.from_arrays(arrays, names=list(DATA_COLUMNS))
+
+
+def write_arrow(result, path):
+    """Write a schedule as an Arrow IPC file"""
+    import pyarrow as pa
+
+    table = schedule_table(result)
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def write_parquet(result, path):
+    """Write a schedule as a Parquet file"""
+    import pyarrow.parquet as pq
+
+    pq.write_table(schedule_table(result), path)
+
+
+def write_schedule(engine, result, path):
+    """Write a schedule in the format given by the extension of ``path``"""
+    extension = os.path.splitext(path)[1].lower()
+    with profiler.phase('export.total'):
+        if extension == '.xlsx':
+            write_excel(engine, result, path)
+        elif extension == '.csv':
+            write_csv(result, path)
+        elif extension in ('.arrow', '.feather', '.ipc'):
+            write_arrow(result, path)
+        elif extension == '.parquet':
+            write_parquet(result, path)
+        else:
+            raise ValueError(f"Unsupported export format: {extension or path}")
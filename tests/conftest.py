@@ -0,0 +1,43 @@
+"""Shared fixtures of the tests"""
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from loan_settings import SETTINGS_VERSION  # noqa: E402
+
+
+@pytest.fixture
+def settings():
+    """Settings of a 15-year loan with a few events of each kind"""
+    return {
+        'version': SETTINGS_VERSION,
+        'loan_amount': '2500000',
+        'apr': '8.65',
+        'year_base': '365',
+        'loan_start_date': '2021-04-12',
+        'emi': '24900',
+        'emi_date': '5',
+        'interest_charged_date': 'EOM',
+        'loan_tenure': '180',
+        'max_schedule_rows': None,
+        'prepayments': [
+            {'type': 'single', 'amount': 150000.0, 'date': '2023-03-18'},
+            {'type': 'recurring', 'amount': 5000.0, 'day': 20,
+             'start_date': '2024-01-01', 'end_date': '2026-12-31'},
+        ],
+        'bank_charges': [
+            {'amount': 1180.0, 'date': '2021-04-12', 'description': 'Processing fee'},
+        ],
+        'manual_emis': [
+            {'amount': 24900.0, 'date': '2022-11-21', 'note': 'Paid at branch'},
+        ],
+        'emi_exclusions': [{'month': 8, 'year': 2022}],
+        'interest_rate_revisions': [
+            {'apr': 9.15, 'date': '2022-07-01'},
+            {'apr': 8.4, 'date': '2025-02-01'},
+        ],
+    }
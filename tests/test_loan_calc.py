@@ -0,0 +1,40 @@
+import json
+
+from loan_calc import main
+
+
+def run_compute(capsys, tmp_path, settings, *args):
+    """Run ``loan-calc compute --json`` on settings and get its summary"""
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps(settings))
+    assert main(['compute', '--settings', str(path), '--json', *args]) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_compute_runs_to_the_end(capsys, tmp_path, settings):
+    summary = run_compute(capsys, tmp_path, settings)
+    assert not summary['truncated']
+    assert summary['days'] > 1000
+
+
+def test_compute_stops_at_max_schedule_rows(capsys, tmp_path, settings):
+    settings['max_schedule_rows'] = 100
+    summary = run_compute(capsys, tmp_path, settings)
+    assert summary['truncated']
+    assert summary['days'] == summary['rows'] == 100
+
+
+def test_max_rows_option_overrides_settings(capsys, tmp_path, settings):
+    settings['max_schedule_rows'] = 100
+    summary = run_compute(capsys, tmp_path, settings, '--max-rows', '250')
+    assert summary['truncated']
+    assert summary['days'] == 250
+
+
+def test_compute_uses_money_of_settings(capsys, tmp_path, settings):
+    floats = run_compute(capsys, tmp_path, settings)
+    settings['money'] = 'paise'
+    paise = run_compute(capsys, tmp_path, settings)
+    assert paise == run_compute(capsys, tmp_path, settings, '--money', 'paise')
+    assert paise['total_interest_paid'] != floats['total_interest_paid']
+    assert run_compute(capsys, tmp_path, settings, '--money', 'float') == floats
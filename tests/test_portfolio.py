@@ -0,0 +1,38 @@
+import json
+
+from loan_settings import engine_from_settings
+from portfolio import run_portfolio
+
+
+def run_batch(tmp_path, loans):
+    """Summarize settings dictionaries as a JSONL batch and get the summaries"""
+    source = tmp_path / 'loans.jsonl'
+    source.write_text(''.join(json.dumps(loan) + '\n' for loan in loans))
+    out = tmp_path / 'summaries.jsonl'
+    run_portfolio(str(source), str(out), workers=1)
+    return [json.loads(line) for line in out.read_text().splitlines()]
+
+
+def test_paise_profile_is_summarized_in_paise(tmp_path, settings):
+    paise_settings = dict(settings, loan_id='paise', money='paise')
+    float_settings = dict(settings, loan_id='float')
+    paise, floats = run_batch(tmp_path, [paise_settings, float_settings])
+
+    engine = engine_from_settings(settings)
+    result = engine.run(money='paise')
+    assert paise['total_interest_paid'] == result.total_interest_paid
+    assert paise['final_balance'] == result.final_balance
+    assert paise['days'] == result.days
+    assert round(paise['total_interest_paid'], 2) == paise['total_interest_paid']
+    assert floats['total_interest_paid'] == engine.run().total_interest_paid
+    assert floats['total_interest_paid'] != paise['total_interest_paid']
+
+
+def test_paise_profile_stops_at_max_schedule_rows(tmp_path, settings):
+    settings = dict(settings, money='paise', max_schedule_rows=400)
+    summary, = run_batch(tmp_path, [settings])
+
+    result = engine_from_settings(settings).run(max_rows=400, money='paise')
+    assert summary['truncated']
+    assert summary['days'] == 400
+    assert summary['total_interest_paid'] == result.total_interest_paid